@@ -4,6 +4,7 @@ sys.path.append(os.getcwd())
 
 from brainbox.core.llm import OllamaClient
 from brainbox.core.embeddings.ollama import OllamaEmbeddingClient
+from brainbox.core.embeddings.cached import CachedEmbeddingClient
 from brainbox.core.vectorstore.in_memory import InMemoryVectorStore
 from brainbox.core.knowledge.chunking.recursive import RecursiveChunker
 from brainbox.core.knowledge.ingestion.knowledge_base import DirectoryKnowledgeBase
@@ -19,7 +20,8 @@ def main():
 
     # STRICTLY REAL CLIENTS
     print("🔌 Connecting to Ollama...")
-    embeddings = OllamaEmbeddingClient()
+    # Cache embeddings on disk so re-runs skip unchanged chunks and repeated queries
+    embeddings = CachedEmbeddingClient(OllamaEmbeddingClient(), cache_path="embedding_cache.db")
     llm = OllamaClient()
 
     # 2. Create Knowledge Base from Directory
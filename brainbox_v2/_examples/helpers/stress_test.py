@@ -8,7 +8,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from brainbox.core.knowledge.documents import Document
 from brainbox.core.vectorstore.chroma import ChromaVectorStore
-from brainbox.core.knowledge.indexing.inverted_index import InvertedIndex
+from brainbox.core.knowledge.indexing.segmented_index import SegmentedIndex
 from brainbox.core.security.rbac import RBACManager, User, Role
 from brainbox.core.routing.prefix_router import PrefixRouter
 from brainbox.core.knowledge.graph.chunk_graph import ChunkGraph
@@ -61,10 +61,14 @@ def run_stress_test():
     # 1. Initialize Components
     print("Initializing components...")
     vector_store = ChromaVectorStore(collection_name="stress_test", persist_directory="./chroma_stress_db")
-    inverted_index = InvertedIndex()
+    # Keyword index persists as compressed segments; reopening it is near-instant
+    inverted_index = SegmentedIndex("./keyword_stress_index")
+    rebuild_keyword_index = inverted_index.doc_count == 0
     rbac = RBACManager()
     router = PrefixRouter()
-    graph = ChunkGraph()
+    # Chunk graph persists as a CSR snapshot and is opened lazily
+    graph = ChunkGraph("./graph_stress")
+    rebuild_graph = len(graph.store) == 0
 
     # 2. Ingestion Stress Test
     print("\n--- Starting Ingestion Stress Test ---")
@@ -75,10 +79,14 @@ def run_stress_test():
     vector_store.add(docs)
     
     # Inverted Index and Graph are iterative in this simple impl
-    for doc in docs:
-        inverted_index.add(doc)
+    if rebuild_keyword_index:
+        for doc in docs:
+            inverted_index.add(doc)
+        inverted_index.flush()
     
-    graph.build(docs) # Graph build supports list
+    if rebuild_graph:
+        graph.build(docs) # Graph build supports list
+        graph.save()
     
     end_time = time.time()
     print(f"Ingestion completed in {end_time - start_time:.2f} seconds.")
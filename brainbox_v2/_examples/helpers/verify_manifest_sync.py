@@ -0,0 +1,101 @@
+import sys
+import os
+import shutil
+import tempfile
+import hashlib
+from typing import List
+
+# Ensure we can import brainbox
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from brainbox.core.embeddings.base import EmbeddingClient
+from brainbox.core.knowledge.chunking.fixed import FixedChunker
+from brainbox.core.knowledge.ingestion.knowledge_base import DirectoryKnowledgeBase
+from brainbox.core.vectorstore.in_memory import InMemoryVectorStore
+from brainbox.core.vectorstore.mmap_store import MmapVectorStore
+
+class HashEmbeddingClient(EmbeddingClient):
+    """Deterministic offline embeddings that count how many texts were embedded."""
+    def __init__(self):
+        self.embedded = 0
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        self.embedded += len(texts)
+        return [[b / 255.0 + 0.01 for b in hashlib.sha256(text.encode("utf-8")).digest()[:16]] for text in texts]
+
+class CountingStore(MmapVectorStore):
+    """Records every delete call so batching can be checked."""
+    deletes = 0
+
+    def delete(self, ids):
+        CountingStore.deletes += 1
+        super().delete(ids)
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def stored_sources(store):
+    return sorted({meta["chunk_id"].rpartition("#")[0] for meta in store._iter_metadata()})
+
+def build(docs, manifest, store, client):
+    return DirectoryKnowledgeBase.from_path(
+        docs, chunker=FixedChunker(size=40, overlap=0), embedding_client=client,
+        vector_store=store, manifest_path=manifest
+    )
+
+def test_manifest_sync():
+    print("Testing manifest-driven sync...")
+    root = tempfile.mkdtemp()
+    try:
+        docs = os.path.join(root, "docs")
+        os.makedirs(docs)
+        manifest = os.path.join(root, "manifest.json")
+        store_path = os.path.join(root, "store")
+        for name in "abcd":
+            write(os.path.join(docs, f"{name}.txt"), f"Document {name}. " * 10)
+
+        client = HashEmbeddingClient()
+        build(docs, manifest, CountingStore(store_path), client)
+        initial = client.embedded
+        assert initial > 0
+
+        # Restart with a persistent store: nothing changed, nothing embedded
+        store = CountingStore.open(store_path)
+        client = HashEmbeddingClient()
+        build(docs, manifest, store, client)
+        assert client.embedded == 0 and CountingStore.deletes == 0
+        sources = stored_sources(store)
+        print(f"  unchanged restart: {len(sources)} documents kept, 0 embedded")
+
+        # Modify two files and remove one: exactly one delete for the whole sync
+        write(os.path.join(docs, "a.txt"), "Rewritten a. " * 5)
+        write(os.path.join(docs, "b.txt"), "Rewritten b. " * 5)
+        os.remove(os.path.join(docs, "c.txt"))
+        client = HashEmbeddingClient()
+        kb = build(docs, manifest, CountingStore.open(store_path), client)
+        store = kb.pipeline.vector_store
+        assert CountingStore.deletes == 1, CountingStore.deletes
+        assert kb.pipeline.chunk_store is None
+        assert len(stored_sources(store)) == len(sources) - 1
+        contents = [meta["content"] for meta in store._iter_metadata()]
+        assert not any(text.startswith("Document a") or "Document c" in text for text in contents)
+        assert any(text.startswith("Rewritten a") for text in contents)
+        print(f"  2 modified + 1 removed: 1 delete, {store.size} chunks")
+
+        # A non-persistent store must not trust the manifest after a restart
+        memory_store = InMemoryVectorStore()
+        client = HashEmbeddingClient()
+        kb = build(docs, manifest, memory_store, client)
+        assert client.embedded > 0
+        assert stored_sources(memory_store) == stored_sources(store)
+        # Chunk metadata of an in-memory store are compact ChunkStore records
+        assert len(kb.pipeline.chunk_store) == memory_store.size
+        print(f"  in-memory restart re-ingested {memory_store.size} chunks into a ChunkStore")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("Manifest Sync Verification Passed!")
+
+if __name__ == "__main__":
+    test_manifest_sync()
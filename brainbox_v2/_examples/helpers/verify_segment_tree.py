@@ -4,6 +4,8 @@ import os
 # Ensure we can import brainbox
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import random
+
 from brainbox.core.knowledge.indexing.segment_tree import SegmentTree, Segment
 
 def test_segment_tree():
@@ -43,5 +45,40 @@ def test_segment_tree():
     
     print("Segment Tree Verification Passed!")
 
+def test_interval_tree_matches_brute_force():
+    print("Testing Segment Tree against brute force...")
+    rng = random.Random(11)
+
+    def key(segments):
+        return sorted((s.start, s.end, s.data) for s in segments)
+
+    for trial in range(50):
+        segments = []
+        for i in range(rng.randint(0, 200)):
+            start = rng.randint(0, 1000)
+            # Includes empty and single-character segments
+            segments.append(Segment(start, start + rng.choice([0, 1, rng.randint(1, 50), rng.randint(1, 400)]), i))
+        bulk = rng.random() < 0.5
+        tree = SegmentTree(segments if bulk else [])
+        if not bulk:
+            for segment in segments:
+                tree.insert(segment)
+        live = [s for s in segments if s.end > s.start]
+        assert len(tree) == len(live)
+
+        for _ in range(100):
+            point = rng.randint(-5, 1500)
+            expected = [s for s in live if s.start <= point < s.end]
+            assert key(tree.query(point)) == key(expected), (trial, point)
+
+            start = rng.randint(-5, 1500)
+            end = start + rng.randint(0, 300)
+            # An empty query range overlaps nothing
+            expected = [s for s in live if s.start < end and start < s.end] if end > start else []
+            assert key(tree.query_range(start, end)) == key(expected), (trial, start, end)
+
+    print("Brute Force Comparison Passed!")
+
 if __name__ == "__main__":
     test_segment_tree()
+    test_interval_tree_matches_brute_force()
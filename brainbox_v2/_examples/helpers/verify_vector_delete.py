@@ -0,0 +1,72 @@
+import sys
+import os
+import shutil
+import tempfile
+
+# Ensure we can import brainbox
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from brainbox.core.vectorstore.in_memory import InMemoryVectorStore
+from brainbox.core.vectorstore.mmap_store import MmapVectorStore
+
+def make_rows(n, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).tolist()
+    metadatas = [{"chunk_id": f"doc{i // 4}#{i % 4}", "content": f"chunk {i}"} for i in range(n)]
+    return vectors, metadatas
+
+def chunk_ids(results):
+    return [hit["metadata"]["chunk_id"] for hit in results]
+
+def test_mmap_delete_matches_in_memory():
+    print("Testing MmapVectorStore delete/compact against InMemoryVectorStore...")
+    root = tempfile.mkdtemp()
+    try:
+        path = os.path.join(root, "store")
+        vectors, metadatas = make_rows(400)
+        reference = InMemoryVectorStore()
+        reference.add(vectors, metadatas)
+        store = MmapVectorStore(path, dim=16)
+        store.add(vectors[:200], metadatas[:200])
+        store.add(vectors[200:], metadatas[200:])
+
+        queries = np.random.default_rng(1).normal(size=(5, 16)).tolist()
+        rounds = [
+            [f"doc{d}#{c}" for d in range(0, 100, 3) for c in range(4)],
+            ["doc1#0", "doc1#1", "missing#0"],
+            [f"doc{d}#2" for d in range(100)],
+        ]
+        for ids in rounds:
+            reference.delete(ids)
+            store.delete(ids)
+            assert store.size == reference.size, (store.size, reference.size)
+            for query in queries:
+                assert chunk_ids(store.search(query, 10)) == chunk_ids(reference.search(query, 10))
+            print(f"  delete({len(ids)} ids) -> {store.size} rows, searches match")
+
+        # Appends after a compaction land in the id map and survive a delete
+        store.add(vectors[:4], [{"chunk_id": f"new#{i}"} for i in range(4)])
+        store.delete(["new#1"])
+        remaining = [meta["chunk_id"] for meta in store._iter_metadata()]
+        assert "new#1" not in remaining and "new#0" in remaining
+
+        # Reopening sees exactly the compacted rows, with nothing left behind
+        reopened = MmapVectorStore.open(path)
+        assert reopened.size == store.size
+        assert [meta["chunk_id"] for meta in reopened._iter_metadata()] == remaining
+        reopened.delete([remaining[0]])
+        assert reopened.size == store.size - 1
+        assert not os.path.exists(path + ".compacting") and not os.path.exists(path + ".retired")
+
+        # Deleting everything leaves an empty, still usable store
+        reopened.delete(remaining)
+        assert reopened.size == 0 and reopened.search(queries[0], 5) == []
+        print("  append/reopen/delete-all OK")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("Vector Delete Verification Passed!")
+
+if __name__ == "__main__":
+    test_mmap_delete_matches_in_memory()
@@ -0,0 +1,164 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from brainbox.core.embeddings.base import EmbeddingClient
+
+class CachedEmbeddingClient(EmbeddingClient):
+    """
+    Caching wrapper around any EmbeddingClient.
+
+    Entries are keyed by (model, sha256(text)), so unchanged chunks and
+    repeated queries never reach the wrapped model. Lookups go through an
+    in-memory LRU tier first, then an optional SQLite tier on disk. Wrap the
+    client once and share it between ingestion and retrieval so both paths
+    hit the same cache.
+
+    Vectors are stored as float32. Cached vectors are kept as immutable
+    tuples and every call returns fresh lists, so callers may modify what
+    they get back without corrupting the cache.
+    """
+    def __init__(
+        self,
+        client: EmbeddingClient,
+        cache_path: Optional[str] = None,
+        model: Optional[str] = None,
+        max_memory_entries: int = 10000,
+        max_disk_entries: Optional[int] = 1000000
+    ):
+        self.client = client
+        self.model = model or getattr(client, "model", client.__class__.__name__)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        if cache_path:
+            self._db = sqlite3.connect(cache_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used)")
+            self._db.commit()
+            # Counted once here, then maintained on every write
+            self._disk_entries = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        else:
+            self._disk_entries = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model}:{digest}"
+
+    def _remember(self, key: str, vector: Tuple[float, ...]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        keys = [self._key(text) for text in texts]
+        found: Dict[str, Tuple[float, ...]] = {}
+
+        with self._lock:
+            # 1. Memory tier
+            for key in keys:
+                if key in self._memory and key not in found:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+            self.memory_hits += sum(1 for key in keys if key in found)
+
+            # 2. Disk tier
+            pending = list(dict.fromkeys(key for key in keys if key not in found))
+            if pending and self._db is not None:
+                disk_found = self._load(pending)
+                for key, vector in disk_found.items():
+                    found[key] = vector
+                    self._remember(key, vector)
+                self.disk_hits += sum(1 for key in keys if key in disk_found)
+
+            missing_keys = list(dict.fromkeys(key for key in keys if key not in found))
+            self.misses += sum(1 for key in keys if key not in found)
+
+        # 3. Embed each distinct missing text once, outside the lock
+        if missing_keys:
+            text_by_key = dict(zip(keys, texts))
+            vectors = self.client.embed([text_by_key[key] for key in missing_keys])
+            computed = {key: tuple(vector) for key, vector in zip(missing_keys, vectors)}
+            with self._lock:
+                for key, vector in computed.items():
+                    self._remember(key, vector)
+                if self._db is not None:
+                    self._store(computed)
+            found.update(computed)
+
+        return [list(found[key]) for key in keys]
+
+    def _load(self, keys: List[str]) -> Dict[str, Tuple[float, ...]]:
+        loaded = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for key, blob in rows:
+                loaded[key] = tuple(np.frombuffer(blob, dtype=np.float32).tolist())
+            if rows:
+                self._db.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE key IN ({placeholders})",
+                    [time.time(), *batch]
+                )
+        self._db.commit()
+        return loaded
+
+    def _store(self, vectors: Dict[str, Sequence[float]]):
+        now = time.time()
+        # A key already on disk holds the same vector (same model and text), so
+        # existing rows are left alone and rowcount is exactly the number added
+        cursor = self._db.executemany(
+            "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+            [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in vectors.items()]
+        )
+        self._disk_entries += max(cursor.rowcount, 0)
+        if self.max_disk_entries is not None and self._disk_entries > self.max_disk_entries:
+            # Evict least recently used rows
+            cursor = self._db.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (self._disk_entries - self.max_disk_entries,)
+            )
+            self._disk_entries -= max(cursor.rowcount, 0)
+        self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "model": self.model,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries
+            }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,15 +1,75 @@
-from typing import List
-import ollama
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import httpx
+from ollama import Client, ResponseError
 from brainbox.core.embeddings.base import EmbeddingClient
 
 class OllamaEmbeddingClient(EmbeddingClient):
-    def __init__(self, model: str = "nomic-embed-text"):
+    """
+    Embeds texts through Ollama's batch `/api/embed` endpoint.
+
+    Texts are split into batches of `batch_size`, up to `max_concurrency`
+    batches are in flight at once, and failed batches are retried with
+    exponential backoff. Output order always matches input order.
+    """
+    def __init__(
+        self,
+        model: str = "nomic-embed-text",
+        host: Optional[str] = None,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        timeout: Optional[float] = None
+    ):
         self.model = model
-    
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._client = Client(host=host, timeout=timeout)
+
     def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+        if len(batches) == 1 or self.max_concurrency == 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                # map() preserves batch order regardless of completion order
+                results = list(pool.map(self._embed_batch, batches))
+
         embeddings = []
-        for text in texts:
-            # Ollama python lib 'embeddings' call:
-            response = ollama.embeddings(model=self.model, prompt=text)
-            embeddings.append(response["embedding"])
+        for batch_embeddings in results:
+            embeddings.extend(batch_embeddings)
         return embeddings
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        attempt = 0
+        while True:
+            try:
+                response = self._client.embed(model=self.model, input=batch)
+                embeddings = response["embeddings"]
+                if len(embeddings) != len(batch):
+                    raise ValueError(f"Expected {len(batch)} embeddings, got {len(embeddings)}")
+                return embeddings
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                # Exponential backoff with jitter so concurrent batches don't retry in lockstep
+                delay = self.backoff_seconds * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay))
+                attempt += 1
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, ResponseError):
+            # Client errors (bad model name, bad request) will not succeed on retry
+            return error.status_code == 429 or error.status_code >= 500
+        # Only transient transport failures; anything else is a bug or bad input
+        return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError))
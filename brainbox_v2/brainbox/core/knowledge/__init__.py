@@ -1,4 +1,5 @@
 from .documents import Document
+from .scored_hit import ScoredHit
 from .retrievers import BaseRetriever, KeywordRetriever
 
-__all__ = ["Document", "BaseRetriever", "KeywordRetriever"]
+__all__ = ["Document", "ScoredHit", "BaseRetriever", "KeywordRetriever"]
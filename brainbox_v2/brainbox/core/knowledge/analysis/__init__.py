@@ -0,0 +1,13 @@
+from .analyzer import Analyzer, default_analyzer
+from .stemmers import Stemmer, EnglishStemmer, SwedishStemmer
+from .stopwords import ENGLISH_STOPWORDS, SWEDISH_STOPWORDS
+
+__all__ = [
+    "Analyzer",
+    "default_analyzer",
+    "Stemmer",
+    "EnglishStemmer",
+    "SwedishStemmer",
+    "ENGLISH_STOPWORDS",
+    "SWEDISH_STOPWORDS"
+]
@@ -0,0 +1,149 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+from brainbox.core.knowledge.documents import Document
+from .stemmers import Stemmer, STEMMERS
+from .stopwords import STOPWORDS
+
+class Analyzer:
+    """
+    Compiled text analysis chain shared by every lexical component
+    (InvertedIndex, KeywordRetriever, LLMReranker):
+
+    NFKC normalization + casefolding -> word tokenization -> stopword removal
+    -> Snowball stemming -> optional character n-grams
+
+    With several languages (e.g. our bilingual English/Swedish HR corpus) the
+    stopword lists are merged, and each text is stemmed with the language
+    whose stopwords it hits most. Short texts without any hits use the first
+    language. Queries are usually that short, so analyze_query() stems each
+    query word under every language and keeps all distinct stems instead.
+
+    Stems are memoized per word. The tokens of a document are cached by
+    document id (and checked against its content), so every component that
+    analyzes the same document reuses one tokenization.
+    """
+    _TOKEN = re.compile(r"\w+")
+
+    def __init__(
+        self,
+        languages: Sequence[str] = ("english",),
+        remove_stopwords: bool = True,
+        stem: bool = True,
+        ngram_range: Optional[Tuple[int, int]] = None,
+        max_cached_documents: int = 50000,
+        max_cached_stems: int = 500000
+    ):
+        unknown = [language for language in languages if language not in STEMMERS]
+        if unknown:
+            raise ValueError(f"Unsupported languages {unknown}, expected some of {tuple(STEMMERS)}")
+        if ngram_range is not None and not 1 <= ngram_range[0] <= ngram_range[1]:
+            raise ValueError("ngram_range must be (min_n, max_n) with 1 <= min_n <= max_n")
+
+        self.languages = tuple(languages)
+        self.remove_stopwords = remove_stopwords
+        self.stem = stem
+        self.ngram_range = ngram_range
+        self.max_cached_documents = max_cached_documents
+        self.max_cached_stems = max_cached_stems
+
+        self._stopwords: Dict[str, FrozenSet[str]] = {language: STOPWORDS[language] for language in self.languages}
+        self._all_stopwords: FrozenSet[str] = frozenset().union(*self._stopwords.values())
+        self._stemmers: Dict[str, Stemmer] = {language: STEMMERS[language]() for language in self.languages}
+        self._stems: Dict[str, Dict[str, str]] = {language: {} for language in self.languages}
+
+        self._documents: "OrderedDict[str, Tuple[str, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def normalize(self, text: str) -> str:
+        return unicodedata.normalize("NFKC", text).casefold()
+
+    def detect_language(self, words: List[str]) -> str:
+        if len(self.languages) == 1:
+            return self.languages[0]
+        hits = [sum(1 for word in words if word in self._stopwords[language]) for language in self.languages]
+        # max() keeps the first language on ties, including the no-hit case
+        return self.languages[max(range(len(hits)), key=hits.__getitem__)]
+
+    def _stem(self, word: str, language: str) -> str:
+        stems = self._stems[language]
+        stemmed = stems.get(word)
+        if stemmed is None:
+            stemmed = self._stemmers[language].stem(word)
+            if len(stems) < self.max_cached_stems:
+                stems[word] = stemmed
+        return stemmed
+
+    def analyze(self, text: str) -> List[str]:
+        """Analyze a query or any other free text."""
+        words = self._TOKEN.findall(self.normalize(text))
+        language = self.detect_language(words)
+        if self.remove_stopwords:
+            words = [word for word in words if word not in self._all_stopwords]
+
+        terms = [self._stem(word, language) for word in words] if self.stem else list(words)
+        terms.extend(self._ngrams(words))
+        return terms
+
+    def analyze_query(self, text: str) -> List[str]:
+        """
+        Analyze a search query so it matches documents indexed under any of
+        the configured languages: each word contributes its stem in every
+        language (duplicates dropped), and scorers OR them together.
+        """
+        if len(self.languages) == 1 or not self.stem:
+            return self.analyze(text)
+
+        words = self._TOKEN.findall(self.normalize(text))
+        if self.remove_stopwords:
+            words = [word for word in words if word not in self._all_stopwords]
+
+        terms = []
+        for word in words:
+            stems = []
+            for language in self.languages:
+                stemmed = self._stem(word, language)
+                if stemmed not in stems:
+                    stems.append(stemmed)
+            terms.extend(stems)
+        terms.extend(self._ngrams(words))
+        return terms
+
+    def _ngrams(self, words: List[str]) -> List[str]:
+        grams = []
+        if self.ngram_range:
+            min_n, max_n = self.ngram_range
+            for word in words:
+                # Boundary markers let prefix/suffix grams differ from inner ones
+                padded = f"<{word}>"
+                for n in range(min_n, max_n + 1):
+                    grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return grams
+
+    def analyze_document(self, document: Document) -> Tuple[str, ...]:
+        """Analyze a document's content, reusing the cached tokens when it is unchanged."""
+        with self._lock:
+            cached = self._documents.get(document.id)
+            if cached is not None and (cached[0] is document.content or cached[0] == document.content):
+                self._documents.move_to_end(document.id)
+                return cached[1]
+
+        terms = tuple(self.analyze(document.content))
+        with self._lock:
+            self._documents[document.id] = (document.content, terms)
+            self._documents.move_to_end(document.id)
+            if len(self._documents) > self.max_cached_documents:
+                self._documents.popitem(last=False)
+        return terms
+
+
+_default_analyzer: Optional[Analyzer] = None
+
+def default_analyzer() -> Analyzer:
+    """Process-wide analyzer, so components created separately share one token cache."""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = Analyzer(languages=("english", "swedish"))
+    return _default_analyzer
@@ -0,0 +1,221 @@
+from abc import ABC, abstractmethod
+from typing import Dict
+
+class Stemmer(ABC):
+    @abstractmethod
+    def stem(self, word: str) -> str:
+        pass
+
+
+def _r1_start(word: str, vowels: str) -> int:
+    """Index after the first non-vowel that follows a vowel (Snowball R1)."""
+    for i in range(1, len(word)):
+        if word[i] not in vowels and word[i - 1] in vowels:
+            return i + 1
+    return len(word)
+
+
+class EnglishStemmer(Stemmer):
+    """
+    Snowball English (Porter2) stemmer, e.g. "connections" -> "connect",
+    "generously" -> "generous".
+    """
+    _VOWELS = "aeiouy"
+    _DOUBLES = ("bb", "dd", "ff", "gg", "mm", "nn", "pp", "rr", "tt")
+    _LI_ENDINGS = "cdeghkmnrt"
+
+    _EXCEPTIONS = {
+        "skis": "ski", "skies": "sky", "dying": "die", "lying": "lie", "tying": "tie",
+        "idly": "idl", "gently": "gentl", "ugly": "ugli", "early": "earli", "only": "onli",
+        "singly": "singl", "sky": "sky", "news": "news", "howe": "howe",
+        "atlas": "atlas", "cosmos": "cosmos", "bias": "bias", "andes": "andes"
+    }
+    _POST_STEP1A = frozenset(("inning", "outing", "canning", "herring", "earring", "proceed", "exceed", "succeed"))
+
+    _STEP2 = (
+        ("ization", "ize"), ("ational", "ate"), ("fulness", "ful"), ("ousness", "ous"),
+        ("iveness", "ive"), ("tional", "tion"), ("biliti", "ble"), ("lessli", "less"),
+        ("entli", "ent"), ("ation", "ate"), ("alism", "al"), ("aliti", "al"), ("ousli", "ous"),
+        ("iviti", "ive"), ("fulli", "ful"), ("enci", "ence"), ("anci", "ance"), ("abli", "able"),
+        ("izer", "ize"), ("ator", "ate"), ("alli", "al"), ("bli", "ble"), ("ogi", "og"), ("li", "")
+    )
+    _STEP3 = (
+        ("ational", "ate"), ("tional", "tion"), ("alize", "al"), ("icate", "ic"), ("iciti", "ic"),
+        ("ative", ""), ("ical", "ic"), ("ness", ""), ("ful", "")
+    )
+    _STEP4 = (
+        "ement", "ance", "ence", "able", "ible", "ment", "ant", "ent", "ism", "ate",
+        "iti", "ous", "ive", "ize", "ion", "al", "er", "ic"
+    )
+
+    def _is_vowel(self, ch: str) -> bool:
+        return ch in self._VOWELS
+
+    def _short_syllable_end(self, word: str) -> bool:
+        n = len(word)
+        if n == 2:
+            return self._is_vowel(word[0]) and not self._is_vowel(word[1])
+        return (
+            n >= 3
+            and not self._is_vowel(word[-3])
+            and self._is_vowel(word[-2])
+            and not self._is_vowel(word[-1])
+            and word[-1] not in "wxY"
+        )
+
+    def _regions(self, word: str):
+        for prefix in ("gener", "commun", "arsen"):
+            if word.startswith(prefix):
+                r1 = len(prefix)
+                break
+        else:
+            r1 = _r1_start(word, self._VOWELS)
+        r2 = r1 + _r1_start(word[r1:], self._VOWELS)
+        return r1, min(r2, len(word))
+
+    def stem(self, word: str) -> str:
+        if len(word) <= 2:
+            return word
+        if word in self._EXCEPTIONS:
+            return self._EXCEPTIONS[word]
+
+        if word.startswith("'"):
+            word = word[1:]
+        chars = list(word)
+        for i, ch in enumerate(chars):
+            if ch == "y" and (i == 0 or chars[i - 1] in self._VOWELS):
+                chars[i] = "Y"
+        word = "".join(chars)
+        r1, r2 = self._regions(word)
+
+        # Step 0: possessives
+        for suffix in ("'s'", "'s", "'"):
+            if word.endswith(suffix):
+                word = word[:-len(suffix)]
+                break
+
+        # Step 1a: plurals
+        if word.endswith("sses"):
+            word = word[:-2]
+        elif word.endswith("ied") or word.endswith("ies"):
+            word = word[:-2] if len(word) > 4 else word[:-1]
+        elif word.endswith("us") or word.endswith("ss"):
+            pass
+        elif word.endswith("s") and any(self._is_vowel(ch) for ch in word[:-2]):
+            word = word[:-1]
+
+        if word in self._POST_STEP1A:
+            return word
+
+        # Step 1b: -ed / -ing
+        for suffix in ("eedly", "ingly", "edly", "eed", "ing", "ed"):
+            if not word.endswith(suffix):
+                continue
+            if suffix in ("eed", "eedly"):
+                if len(word) - len(suffix) >= r1:
+                    word = word[:-len(suffix)] + "ee"
+            else:
+                stem = word[:-len(suffix)]
+                if any(self._is_vowel(ch) for ch in stem):
+                    word = stem
+                    if word.endswith(("at", "bl", "iz")):
+                        word += "e"
+                    elif word.endswith(self._DOUBLES):
+                        word = word[:-1]
+                    elif r1 >= len(word) and self._short_syllable_end(word):
+                        word += "e"
+            break
+
+        # Step 1c: y -> i after a consonant that is not the first letter
+        if len(word) > 2 and word[-1] in "yY" and not self._is_vowel(word[-2]):
+            word = word[:-1] + "i"
+
+        # Step 2
+        for suffix, replacement in self._STEP2:
+            if word.endswith(suffix):
+                if len(word) - len(suffix) >= r1:
+                    if suffix == "ogi":
+                        if word[-4:-3] == "l":
+                            word = word[:-3] + replacement
+                    elif suffix == "li":
+                        if word[-3:-2] and word[-3] in self._LI_ENDINGS:
+                            word = word[:-2]
+                    else:
+                        word = word[:-len(suffix)] + replacement
+                break
+
+        # Step 3
+        for suffix, replacement in self._STEP3:
+            if word.endswith(suffix):
+                start = len(word) - len(suffix)
+                if start >= r1 and (suffix != "ative" or start >= r2):
+                    word = word[:start] + replacement
+                break
+
+        # Step 4
+        for suffix in self._STEP4:
+            if word.endswith(suffix):
+                start = len(word) - len(suffix)
+                if start >= r2 and (suffix != "ion" or word[start - 1:start] in ("s", "t")):
+                    word = word[:start]
+                break
+
+        # Step 5
+        if word.endswith("e"):
+            start = len(word) - 1
+            if start >= r2 or (start >= r1 and not self._short_syllable_end(word[:-1])):
+                word = word[:-1]
+        elif word.endswith("ll") and len(word) - 1 >= r2:
+            word = word[:-1]
+
+        return word.replace("Y", "y")
+
+
+class SwedishStemmer(Stemmer):
+    """Snowball Swedish stemmer, e.g. "anställningar" -> "anställning"."""
+    _VOWELS = "aeiouyäåö"
+    _S_ENDINGS = "bcdfghjklmnoprtvy"
+
+    _STEP1 = tuple(sorted((
+        "a", "arna", "erna", "heterna", "orna", "ad", "e", "ade", "ande", "arne", "are",
+        "aste", "en", "anden", "aren", "heten", "ern", "ar", "er", "heter", "or", "as",
+        "arnas", "ernas", "ornas", "es", "ades", "andes", "ens", "arens", "hetens", "erns",
+        "at", "andet", "het", "ast"
+    ), key=len, reverse=True))
+    _STEP2 = ("dd", "gd", "nn", "dt", "gt", "kt", "tt")
+    _STEP3 = (("fullt", "full"), ("löst", "lös"), ("lig", ""), ("els", ""), ("ig", ""))
+
+    def stem(self, word: str) -> str:
+        # R1 always leaves at least three letters before it
+        r1 = max(3, _r1_start(word, self._VOWELS))
+        if r1 >= len(word):
+            return word
+
+        # Step 1: inflectional endings in R1; a bare -s only after a valid s-ending
+        for suffix in self._STEP1:
+            if word.endswith(suffix) and len(word) - len(suffix) >= r1:
+                word = word[:-len(suffix)]
+                break
+        else:
+            if word.endswith("s") and len(word) - 1 >= r1 and word[-2] in self._S_ENDINGS:
+                word = word[:-1]
+
+        # Step 2: undouble consonant endings
+        for suffix in self._STEP2:
+            if word.endswith(suffix) and len(word) - 2 >= r1:
+                word = word[:-1]
+                break
+
+        # Step 3: derivational endings
+        for suffix, replacement in self._STEP3:
+            if word.endswith(suffix) and len(word) - len(suffix) >= r1:
+                word = word[:-len(suffix)] + replacement
+                break
+
+        return word
+
+
+STEMMERS: Dict[str, type] = {
+    "english": EnglishStemmer,
+    "swedish": SwedishStemmer
+}
@@ -1,3 +1,5 @@
-from .base import Chunker
+from .base import Chunker, TextChunk
 from .fixed import FixedChunker
 from .spec import ChunkSpec
+from .token import TokenChunker
+from .tokenizers import Tokenizer, RegexTokenizer, WhitespaceTokenizer
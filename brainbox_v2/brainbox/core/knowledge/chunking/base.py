@@ -1,8 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional
+
+@dataclass
+class TextChunk:
+    text: str
+    # Character range in the source text; None when the chunk is not a verbatim slice of it
+    start: Optional[int]  # inclusive
+    end: Optional[int]    # exclusive
 
 class Chunker(ABC):
     @abstractmethod
     def chunk(self, text: str) -> List[str]:
         """Splits text into chunks."""
         pass
+
+    def chunk_with_offsets(self, text: str) -> List[TextChunk]:
+        """
+        Splits text into chunks annotated with their source offsets.
+        Chunkers that track ranges natively should override this; the default
+        locates each chunk with a forward search. Chunks that do not occur
+        verbatim in the text get None offsets rather than a guessed range.
+        """
+        chunks = []
+        cursor = 0
+        for chunk_text in self.chunk(text):
+            start = text.find(chunk_text, cursor)
+            if start == -1:
+                start = text.find(chunk_text)
+            if start == -1:
+                chunks.append(TextChunk(chunk_text, None, None))
+                continue
+            chunks.append(TextChunk(chunk_text, start, start + len(chunk_text)))
+            cursor = start + 1
+        return chunks
@@ -1,5 +1,5 @@
 from typing import List
-from .base import Chunker
+from .base import Chunker, TextChunk
 
 class FixedChunker(Chunker):
     def __init__(self, size: int = 512, overlap: int = 64):
@@ -7,6 +7,9 @@ class FixedChunker(Chunker):
         self.overlap = overlap
 
     def chunk(self, text: str) -> List[str]:
+        return [chunk.text for chunk in self.chunk_with_offsets(text)]
+
+    def chunk_with_offsets(self, text: str) -> List[TextChunk]:
         if not text:
             return []
             
@@ -20,8 +23,7 @@ class FixedChunker(Chunker):
             if end > text_len:
                 end = text_len
                 
-            chunk = text[start:end]
-            chunks.append(chunk)
+            chunks.append(TextChunk(text[start:end], start, end))
             
             # Stop if we reached the end
             if end == text_len:
@@ -1,11 +1,20 @@
 from typing import List, Optional
-import re
-from .base import Chunker
+from .base import Chunker, TextChunk
 
 class RecursiveChunker(Chunker):
+    """
+    Structure-aware chunker: splits on the coarsest separator present
+    (paragraph, line, word, then character) and greedily merges the pieces
+    back up to `chunk_size`.
+
+    Works on (start, end) index ranges over the original text, so no
+    intermediate split lists or joined strings are built and every chunk
+    carries its source offsets. A chunk is always a verbatim, whitespace-
+    trimmed slice of the input and never longer than chunk_size.
+    """
     def __init__(
-        self, 
-        chunk_size: int = 512, 
+        self,
+        chunk_size: int = 512,
         chunk_overlap: int = 64,
         separators: Optional[List[str]] = None
     ):
@@ -15,84 +24,77 @@ class RecursiveChunker(Chunker):
         self.separators = separators or ["\n\n", "\n", " ", ""]
 
     def chunk(self, text: str) -> List[str]:
-        return self._split_text(text, self.separators)
+        return [chunk.text for chunk in self.chunk_with_offsets(text)]
+
+    def chunk_with_offsets(self, text: str) -> List[TextChunk]:
+        chunks: List[TextChunk] = []
+        if text:
+            self._split_range(text, 0, len(text), self.separators, chunks)
+        return chunks
 
-    def _split_text(self, text: str, separators: List[str]) -> List[str]:
-        """Recursively splits text by the first valid separator."""
-        final_chunks = []
-        
+    def _split_range(self, text: str, start: int, end: int, separators: List[str], out: List[TextChunk]):
+        """Splits text[start:end] by the first separator it contains, recursing on oversized pieces."""
         # 1. Find the appropriate separator
         separator = separators[-1] # Default to characters
-        new_separators = []
-        
+        new_separators: List[str] = []
+
         for i, sep in enumerate(separators):
             if sep == "": # Character level
                 separator = ""
                 break
-            if re.search(re.escape(sep), text): # If separator exists in text
+            if text.find(sep, start, end) != -1: # If separator exists in range
                 separator = sep
                 new_separators = separators[i+1:]
                 break
-                
-        # 2. Split
-        if separator:
-            splits = text.split(separator)
-        else:
-            splits = list(text) # Char split
 
-        # 3. Merge splits into chunks
-        current_chunk = []
-        current_length = 0
-        
-        for split in splits:
-            split_len = len(split)
-            
-            # If a single split is too big, recurse on it
-            if split_len > self.chunk_size:
-                if new_separators:
-                    sub_chunks = self._split_text(split, new_separators)
-                    final_chunks.extend(sub_chunks)
-                else:
-                    # Hard chop if no more separators
-                    final_chunks.extend(self._hard_chop(split))
+        if not separator:
+            # Character level: every piece has length 1, so merging degenerates to fixed windows
+            for window_start in range(start, end, self.chunk_size):
+                self._emit(text, window_start, min(window_start + self.chunk_size, end), out)
+            return
+
+        # 2. Greedily pack consecutive splits into chunks of at most chunk_size.
+        # Rather than visiting every split, jump to the last separator that still
+        # fits, so the work per chunk is a single bounded rfind.
+        sep_len = len(separator)
+        pos = start
+
+        while pos < end:
+            limit = pos + self.chunk_size
+            if limit >= end:
+                self._emit(text, pos, end, out)
+                return
+
+            cut = text.rfind(separator, pos, limit + sep_len)
+            if cut != -1:
+                self._emit(text, pos, cut, out)
+                pos = cut + sep_len
                 continue
 
-            # Check if adding this split exceeds chunk size
-            # Add separator length estimation (naively 1 char or len(sep))
-            sep_len = len(separator) if separator else 0
-            
-            if current_length + split_len + sep_len > self.chunk_size:
-                # Flush current chunk
-                doc_chunk = self._join_splits(current_chunk, separator)
-                if doc_chunk:
-                    final_chunks.append(doc_chunk)
-                
-                # Start new chunk with overlaps if needed (simple implementation for now: just start new)
-                # For basic recursive, we often don't strictly enforce overlap on the structural boundaries 
-                # as nicely as fixed, but we can keep the last item.
-                
-                # Improvements: sophisticated overlap logic. 
-                # For now: just reset.
-                current_chunk = [split]
-                current_length = split_len
+            # The split starting at pos is itself larger than chunk_size
+            split_end = text.find(separator, limit, end)
+            if split_end == -1:
+                split_end = end
+            if new_separators:
+                self._split_range(text, pos, split_end, new_separators, out)
             else:
-                current_chunk.append(split)
-                current_length += split_len + sep_len
-                
-        # Flush remainder
-        if current_chunk:
-            doc_chunk = self._join_splits(current_chunk, separator)
-            if doc_chunk:
-                final_chunks.append(doc_chunk)
-                
-        return final_chunks
+                # Hard chop if no more separators
+                self._hard_chop(text, pos, split_end, out)
+            pos = split_end + sep_len
 
-    def _join_splits(self, splits: List[str], separator: str) -> str:
-        return separator.join(splits).strip()
+    @staticmethod
+    def _emit(text: str, start: int, end: int, out: List[TextChunk]):
+        # Trim surrounding whitespace by moving the range bounds
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            out.append(TextChunk(text[start:end], start, end))
 
-    def _hard_chop(self, text: str) -> List[str]:
+    def _hard_chop(self, text: str, start: int, end: int, out: List[TextChunk]):
         """Fallback for massive blocks with no separators."""
-        chunks = []
-        for i in range(0, len(text), self.chunk_size - self.chunk_overlap):
-            chunks.append(text[i : i + self.chunk_size])
-        return chunks
+        stride = max(1, self.chunk_size - self.chunk_overlap)
+        for i in range(start, end, stride):
+            chunk_end = min(i + self.chunk_size, end)
+            out.append(TextChunk(text[i:chunk_end], i, chunk_end))
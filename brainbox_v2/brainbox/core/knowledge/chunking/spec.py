@@ -4,4 +4,4 @@ from dataclasses import dataclass
 class ChunkSpec:
     size: int = 512          # tokens or chars (depending on chunker)
     overlap: int = 64
-    strategy: str = "fixed"  # fixed | semantic | sentence
+    strategy: str = "fixed"  # fixed | recursive | token | semantic | sentence
@@ -0,0 +1,120 @@
+import re
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from .base import Chunker, TextChunk
+from .tokenizers import Tokenizer, RegexTokenizer
+
+class TokenChunker(Chunker):
+    """
+    Chunks by token budget instead of characters, so chunks fit the
+    embedding model's context window.
+
+    The text is segmented into whitespace-delimited words; each distinct word
+    is tokenized once and its count memoized. The per-document segmentation is
+    memoized too, so re-chunking the same text at a different size does not
+    touch the tokenizer again. Chunks prefer to end on a paragraph or line
+    break when one falls in the second half of the budget.
+    """
+    _SEGMENT = re.compile(r"\S+")
+
+    def __init__(
+        self,
+        max_tokens: int = 256,
+        overlap_tokens: int = 32,
+        tokenizer: Optional[Tokenizer] = None,
+        max_cached_segments: int = 200000,
+        max_cached_documents: int = 32
+    ):
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be >= 1")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = max(0, min(overlap_tokens, max_tokens - 1))
+        self.tokenizer = tokenizer or RegexTokenizer()
+        self.max_cached_segments = max_cached_segments
+        self.max_cached_documents = max_cached_documents
+
+        self._segment_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._documents: "OrderedDict[str, Tuple[List[int], List[int], List[int]]]" = OrderedDict()
+
+    def _count(self, segment: str) -> int:
+        count = self._segment_counts.get(segment)
+        if count is None:
+            count = self.tokenizer.count(segment)
+            self._segment_counts[segment] = count
+            if len(self._segment_counts) > self.max_cached_segments:
+                self._segment_counts.popitem(last=False)
+        else:
+            self._segment_counts.move_to_end(segment)
+        return count
+
+    def _segments(self, text: str) -> Tuple[List[int], List[int], List[int]]:
+        """Returns parallel lists of segment starts, ends and token counts."""
+        cached = self._documents.get(text)
+        if cached is not None:
+            self._documents.move_to_end(text)
+            return cached
+
+        starts, ends, counts = [], [], []
+        for match in self._SEGMENT.finditer(text):
+            starts.append(match.start())
+            ends.append(match.end())
+            counts.append(self._count(match.group()))
+
+        segments = (starts, ends, counts)
+        self._documents[text] = segments
+        if len(self._documents) > self.max_cached_documents:
+            self._documents.popitem(last=False)
+        return segments
+
+    def chunk(self, text: str) -> List[str]:
+        return [chunk.text for chunk in self.chunk_with_offsets(text)]
+
+    def chunk_with_offsets(self, text: str) -> List[TextChunk]:
+        if not text:
+            return []
+
+        starts, ends, counts = self._segments(text)
+        chunks: List[TextChunk] = []
+        n = len(starts)
+        i = 0
+
+        while i < n:
+            # Oversized single segment (e.g. a huge URL): split it by characters
+            if counts[i] > self.max_tokens:
+                self._split_segment(text, starts[i], ends[i], counts[i], chunks)
+                i += 1
+                continue
+
+            # Greedily take segments while they fit the budget
+            j = i
+            used = 0
+            last_break = -1
+            while j < n and used + counts[j] <= self.max_tokens:
+                used += counts[j]
+                j += 1
+                # Remember the last structural break that leaves the chunk at least half full
+                if j < n and used * 2 >= self.max_tokens and "\n" in text[ends[j - 1]:starts[j]]:
+                    last_break = j
+            if j < n and last_break != -1:
+                j = last_break
+
+            chunks.append(TextChunk(text[starts[i]:ends[j - 1]], starts[i], ends[j - 1]))
+            if j >= n:
+                break
+
+            # Step back over trailing segments worth up to overlap_tokens
+            next_i = j
+            overlap = 0
+            while next_i - 1 > i and overlap + counts[next_i - 1] <= self.overlap_tokens:
+                next_i -= 1
+                overlap += counts[next_i]
+            i = next_i
+
+        return chunks
+
+    def _split_segment(self, text: str, start: int, end: int, count: int, chunks: List[TextChunk]):
+        pieces = -(-count // self.max_tokens)
+        step = -(-(end - start) // pieces)
+        for piece_start in range(start, end, step):
+            piece_end = min(piece_start + step, end)
+            chunks.append(TextChunk(text[piece_start:piece_end], piece_start, piece_end))
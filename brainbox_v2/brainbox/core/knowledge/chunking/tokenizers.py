@@ -0,0 +1,43 @@
+import re
+from abc import ABC, abstractmethod
+from typing import List
+
+class Tokenizer(ABC):
+    @abstractmethod
+    def tokenize(self, text: str) -> List[str]:
+        pass
+
+    def count(self, text: str) -> int:
+        return len(self.tokenize(text))
+
+class RegexTokenizer(Tokenizer):
+    """
+    Fast, dependency-free approximation of a subword (BPE) tokenizer.
+    Words and punctuation marks are tokens; words longer than
+    `chars_per_token` are counted as several subword pieces, which is close
+    to what BPE vocabularies do for rare or long words.
+    """
+    _PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+    def __init__(self, chars_per_token: int = 4):
+        self.chars_per_token = max(1, chars_per_token)
+
+    def tokenize(self, text: str) -> List[str]:
+        tokens = []
+        step = self.chars_per_token
+        for match in self._PATTERN.finditer(text):
+            word = match.group()
+            if len(word) <= step:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + step] for i in range(0, len(word), step))
+        return tokens
+
+    def count(self, text: str) -> int:
+        step = self.chars_per_token
+        # Same result as len(tokenize(text)) without building the pieces
+        return sum(-(-len(match.group()) // step) for match in self._PATTERN.finditer(text))
+
+class WhitespaceTokenizer(Tokenizer):
+    def tokenize(self, text: str) -> List[str]:
+        return text.split()
@@ -1,73 +1,150 @@
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 from brainbox.core.knowledge.documents import Document
-from brainbox.core.knowledge.graph.graph_store import SimpleGraphStore
+from brainbox.core.knowledge.graph.graph_store import IndexedGraphStore
 
 class ChunkGraph:
     """
     Builds a graph of document chunks.
     Links chunks by:
     1. Sequence (NEXT/PREV)
-    2. Parent Document (PARENT)
+    2. Parent Document (CHILD_OF/HAS_CHILD)
+
+    The graph is maintained incrementally: add() splices chunks into their
+    parent's chain and remove() unlinks them, rewiring NEXT/PREV around the
+    gap, so neither rebuilds anything and re-adding a chunk never duplicates
+    edges. With a `directory`, save() persists the graph as a memory-mapped
+    CSR snapshot that the next ChunkGraph(directory) opens lazily.
     """
-    def __init__(self):
-        self.store = SimpleGraphStore()
+    def __init__(self, directory: Optional[str] = None):
+        self.store = IndexedGraphStore(directory)
+
+    @staticmethod
+    def _parent_of(doc: Document) -> str:
+        return doc.metadata.get("parent_id", "root")
+
+    def _order_key(self, doc_id: str) -> Tuple[int, str]:
+        doc = self.store.get_node(doc_id)
+        return (doc.metadata.get("chunk_index", 0) if doc is not None else 0, doc_id)
+
+    def _insert_position(self, children: List[str], key: Tuple[int, str]) -> int:
+        # Binary search so only O(log n) sibling documents are looked at
+        low, high = 0, len(children)
+        while low < high:
+            mid = (low + high) // 2
+            if self._order_key(children[mid]) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _link(self, previous_id: Optional[str], next_id: Optional[str]):
+        if previous_id is not None:
+            self.store.set_neighbors(previous_id, "NEXT", [next_id] if next_id is not None else [])
+        if next_id is not None:
+            self.store.set_neighbors(next_id, "PREV", [previous_id] if previous_id is not None else [])
 
     def build(self, documents: List[Document]):
         """
         Builds the graph from a list of documents.
         Assumes documents are chunks and might have metadata indicating sequence.
+        Calling it again adds to (or updates) the existing graph.
         """
-        # Group by parent document if possible
-        doc_groups = {}
+        self.add(documents)
+
+    def add(self, documents: Iterable[Document]):
+        """
+        Add chunks, linking each to its parent and splicing it into the
+        parent's chain by chunk_index. Chunks already present are replaced.
+        """
+        doc_groups: Dict[str, List[Document]] = {}
         for doc in documents:
-            parent_id = doc.metadata.get("parent_id", "root")
-            if parent_id not in doc_groups:
-                doc_groups[parent_id] = []
-            doc_groups[parent_id].append(doc)
+            doc_groups.setdefault(self._parent_of(doc), []).append(doc)
 
         for parent_id, docs in doc_groups.items():
-            # Sort by sequence index if available
-            docs.sort(key=lambda x: x.metadata.get("chunk_index", 0))
-            
-            for i, doc in enumerate(docs):
+            self.remove([doc.id for doc in docs if doc.id in self.store])
+            docs = list({doc.id: doc for doc in docs}.values())
+            docs.sort(key=lambda d: (d.metadata.get("chunk_index", 0), d.id))
+
+            # Merge the sorted new chunks into the existing chain in one pass
+            existing = self.store.neighbor_ids(parent_id, "HAS_CHILD")
+            positions = [self._insert_position(existing, (d.metadata.get("chunk_index", 0), d.id)) for d in docs]
+            children: List[str] = []
+            added = set()
+            cursor = 0
+            for doc, position in zip(docs, positions):
+                children.extend(existing[cursor:position])
+                cursor = position
+                children.append(doc.id)
+                added.add(doc.id)
                 self.store.add_node(doc.id, data=doc)
-                
-                # Link to parent
-                self.store.add_edge(doc.id, parent_id, "CHILD_OF")
-                self.store.add_edge(parent_id, doc.id, "HAS_CHILD")
+                self.store.set_neighbors(doc.id, "CHILD_OF", [parent_id])
+            children.extend(existing[cursor:])
+            self.store.set_neighbors(parent_id, "HAS_CHILD", children)
+
+            # Relink only around the new chunks
+            for i, doc_id in enumerate(children):
+                if doc_id in added:
+                    self._link(children[i - 1] if i > 0 else None, doc_id)
+                    following = children[i + 1] if i + 1 < len(children) else None
+                    if following not in added:
+                        self._link(doc_id, following)
 
-                # Link sequential
-                if i > 0:
-                    prev_doc = docs[i-1]
-                    self.store.add_edge(prev_doc.id, doc.id, "NEXT")
-                    self.store.add_edge(doc.id, prev_doc.id, "PREV")
+    def remove(self, chunk_ids: Iterable[str]) -> int:
+        """
+        Remove chunks, reconnecting their former neighbours to each other.
+        Returns the number of chunks removed.
+        """
+        doc_groups: Dict[Optional[str], List[str]] = {}
+        for chunk_id in chunk_ids:
+            if chunk_id in self.store:
+                parents = self.store.neighbor_ids(chunk_id, "CHILD_OF")
+                doc_groups.setdefault(parents[0] if parents else None, []).append(chunk_id)
+
+        removed_count = 0
+        for parent_id, ids in doc_groups.items():
+            removed = set(ids)
+            if parent_id is not None:
+                children = self.store.neighbor_ids(parent_id, "HAS_CHILD")
+                remaining = [(i, c) for i, c in enumerate(children) if c not in removed]
+                # Bridge every gap the removal opened in the chain
+                previous_index, previous_id = -1, None
+                for i, doc_id in remaining:
+                    if i != previous_index + 1:
+                        self._link(previous_id, doc_id)
+                    previous_index, previous_id = i, doc_id
+                if previous_index != len(children) - 1:
+                    self._link(previous_id, None)
+
+                if remaining:
+                    self.store.set_neighbors(parent_id, "HAS_CHILD", [c for _, c in remaining])
+                else:
+                    self.store.remove_node(parent_id)
+
+            for chunk_id in removed:
+                removed_count += self.store.remove_node(chunk_id)
+        return removed_count
+
+    def remove_document(self, parent_id: str) -> int:
+        """Remove all chunks of a parent document."""
+        return self.remove(self.store.neighbor_ids(parent_id, "HAS_CHILD"))
+
+    def save(self, directory: Optional[str] = None):
+        """Persist the graph as a CSR snapshot (see IndexedGraphStore.save)."""
+        self.store.save(directory)
 
     def get_contextlist(self, doc_id: str, window: int = 1) -> List[Document]:
         """
         Get neighboring chunks (prev/next) for context window expansion.
         """
-        context = []
-        
-        # Get PREV
-        curr = doc_id
-        for _ in range(window):
-            neighbors = self.store.get_neighbors(curr, "PREV")
-            if not neighbors:
-                break
-            prev_id, prev_data = neighbors[0] # Assume linear chain
-            context.insert(0, prev_data)
-            curr = prev_id
-
-        # Add Self (if needed, but usually we have it)
-        
-        # Get NEXT
-        curr = doc_id
-        for _ in range(window):
-            neighbors = self.store.get_neighbors(curr, "NEXT")
-            if not neighbors:
-                break
-            next_id, next_data = neighbors[0]
-            context.append(next_data)
-            curr = next_id
-            
-        return context
+        # PREV walks away from the chunk; reverse it into reading order
+        previous = [data for _, data in self.store.walk(doc_id, "PREV", window)]
+        previous.reverse()
+        following = [data for _, data in self.store.walk(doc_id, "NEXT", window)]
+        return previous + following
+
+    def expand(self, doc_ids: Iterable[str], window: int = 1) -> Dict[str, List[Document]]:
+        """
+        Batched get_contextlist: neighbouring chunks for each of several
+        chunks (e.g. a whole top-k), keyed by chunk id.
+        """
+        return {doc_id: self.get_contextlist(doc_id, window) for doc_id in dict.fromkeys(doc_ids)}
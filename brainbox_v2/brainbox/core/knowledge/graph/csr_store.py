@@ -0,0 +1,169 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from brainbox.core.knowledge.documents import Document
+
+class CSRGraphStore:
+    """
+    Immutable on-disk graph snapshot in compressed sparse row form.
+
+    Files in the snapshot directory:
+    - nodes.bin  : node ids, UTF-8, sorted bytewise and concatenated
+    - nodes.idx  : uint64 offsets of each id in nodes.bin (node count + 1)
+    - edges.idx  : uint64 matrix (relations x (node count + 1)); row r holds the
+                   CSR offsets of every node's relation-r targets in edges.bin
+    - edges.bin  : uint32 target node ordinals
+    - data.jsonl : one JSON line per node with its data (empty line for None)
+    - data.idx   : uint64 offsets into data.jsonl (node count + 1)
+    - graph.json : node count, edge count and relation names
+
+    A node's ordinal is its rank in the sorted id table, so ids are found by
+    binary search. Everything is memory-mapped and decoded on demand, so
+    opening a million-node graph costs a few page faults rather than a rebuild.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "graph.json"), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        self.node_count: int = info["node_count"]
+        self.edge_count: int = info["edge_count"]
+        self.relations: List[str] = info["relations"]
+
+        self._node_bytes = self._map("nodes.bin", np.uint8)
+        self._node_offsets = self._map("nodes.idx", np.uint64)
+        self._edge_offsets = self._map("edges.idx", np.uint64)
+        if self._edge_offsets is not None:
+            self._edge_offsets = self._edge_offsets.reshape(len(self.relations), self.node_count + 1)
+        self._edge_targets = self._map("edges.bin", np.uint32)
+        self._data = self._map("data.jsonl", np.uint8)
+        self._data_offsets = self._map("data.idx", np.uint64)
+
+    def _map(self, name: str, dtype) -> Optional[np.ndarray]:
+        file_path = os.path.join(self.path, name)
+        if os.path.getsize(file_path) == 0:
+            return None
+        return np.memmap(file_path, dtype=dtype, mode="r")
+
+    def __len__(self) -> int:
+        return self.node_count
+
+    # --- Writing ------------------------------------------------------------
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        node_ids: Sequence[str],
+        node_data: Sequence[Any],
+        relations: Sequence[str],
+        adjacency: Sequence[Dict[int, Sequence[int]]]
+    ) -> "CSRGraphStore":
+        """
+        Write a snapshot. Nodes are given as parallel id/data lists; for each
+        relation, `adjacency[r]` maps a node's position in those lists to the
+        positions of its targets. Node data must be JSON-serializable (or a
+        Document with such metadata); it is all encoded before any file is
+        written, so a bad value raises ValueError without leaving a partial snapshot.
+        """
+        encoded = [node_id.encode("utf-8") for node_id in node_ids]
+        order = sorted(range(len(encoded)), key=encoded.__getitem__)
+        ordinal = [0] * len(order)
+        for rank, position in enumerate(order):
+            ordinal[position] = rank
+        count = len(order)
+
+        lines: List[bytes] = []
+        for position in order:
+            data = node_data[position]
+            if data is None:
+                lines.append(b"")
+                continue
+            try:
+                lines.append(json.dumps(cls._encode_data(data), ensure_ascii=False).encode("utf-8"))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Data of graph node {node_ids[position]!r} is not JSON-serializable: {e}") from e
+
+        os.makedirs(path, exist_ok=True)
+
+        node_offsets = [0]
+        data_offsets = [0]
+        with open(os.path.join(path, "nodes.bin"), "wb") as node_file, \
+                open(os.path.join(path, "data.jsonl"), "wb") as data_file:
+            node_position, data_position = 0, 0
+            for position in order:
+                node_file.write(encoded[position])
+                node_position += len(encoded[position])
+                node_offsets.append(node_position)
+            for line in lines:
+                data_file.write(line + b"\n")
+                data_position += len(line) + 1
+                data_offsets.append(data_position)
+        np.asarray(node_offsets, dtype=np.uint64).tofile(os.path.join(path, "nodes.idx"))
+        np.asarray(data_offsets, dtype=np.uint64).tofile(os.path.join(path, "data.idx"))
+
+        edge_offsets: List[int] = []
+        targets: List[int] = []
+        for edges in adjacency:
+            edge_offsets.append(len(targets))
+            for position in order:
+                node_targets = edges.get(position)
+                if node_targets:
+                    targets.extend([ordinal[t] for t in node_targets])
+                edge_offsets.append(len(targets))
+        np.asarray(edge_offsets, dtype=np.uint64).tofile(os.path.join(path, "edges.idx"))
+        np.asarray(targets, dtype=np.uint32).tofile(os.path.join(path, "edges.bin"))
+
+        # graph.json is written last: its presence marks a complete snapshot
+        with open(os.path.join(path, "graph.json"), "w", encoding="utf-8") as f:
+            json.dump({"node_count": count, "edge_count": len(targets), "relations": list(relations)}, f)
+        return cls(path)
+
+    @staticmethod
+    def _encode_data(data: Any) -> Dict[str, Any]:
+        if isinstance(data, Document):
+            return {"document": {
+                "id": data.id,
+                "content": data.content,
+                "metadata": dict(data.metadata or {}),
+                "score": data.score
+            }}
+        return {"value": data}
+
+    # --- Reading ------------------------------------------------------------
+
+    def key(self, node: int) -> str:
+        start, end = int(self._node_offsets[node]), int(self._node_offsets[node + 1])
+        return self._node_bytes[start:end].tobytes().decode("utf-8")
+
+    def ordinal_of(self, node_id: str) -> Optional[int]:
+        target = node_id.encode("utf-8")
+        low, high = 0, self.node_count
+        while low < high:
+            mid = (low + high) // 2
+            start, end = int(self._node_offsets[mid]), int(self._node_offsets[mid + 1])
+            if self._node_bytes[start:end].tobytes() < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.node_count and self.key(low) == node_id:
+            return low
+        return None
+
+    def data(self, node: int) -> Any:
+        start, end = int(self._data_offsets[node]), int(self._data_offsets[node + 1]) - 1
+        if end <= start:
+            return None
+        record = json.loads(self._data[start:end].tobytes().decode("utf-8"))
+        if "document" in record:
+            return Document(**record["document"])
+        return record["value"]
+
+    def targets(self, node: int, relation: int) -> List[int]:
+        start, end = int(self._edge_offsets[relation, node]), int(self._edge_offsets[relation, node + 1])
+        return self._edge_targets[start:end].tolist() if end > start else []
+
+    def close(self):
+        # Drop the maps; numpy releases them once no views remain
+        self._node_bytes = self._node_offsets = self._edge_offsets = None
+        self._edge_targets = self._data = self._data_offsets = None
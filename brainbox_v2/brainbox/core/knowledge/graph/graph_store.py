@@ -1,5 +1,10 @@
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple
+from array import array
 import collections
+import json
+import os
+import shutil
+from brainbox.core.knowledge.graph.csr_store import CSRGraphStore
 
 class SimpleGraphStore:
     """
@@ -51,3 +56,280 @@ class SimpleGraphStore:
                     queue.append((neighbor, path + [neighbor]))
                     
         return []
+
+
+class IndexedGraphStore:
+    """
+    In-memory graph store indexed by (node, relation).
+
+    Node ids and relation names are interned to small integers, and the
+    targets of each (node, relation) pair are kept in a compact int array,
+    so fetching the neighbours for one relation is a single dict lookup
+    instead of a scan over the node's whole adjacency list. Edges are
+    deduplicated. Drop-in compatible with SimpleGraphStore.
+
+    A store opened from a directory sits on top of a memory-mapped
+    CSRGraphStore snapshot: snapshot nodes keep their ordinals, and changes
+    are copy-on-write per (node, relation), so nothing is loaded up front.
+    save() writes a fresh snapshot and swaps it in atomically.
+    """
+    MANIFEST = "graph.json"
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.base: Optional[CSRGraphStore] = None
+        self._generation = 0
+        if directory is not None:
+            manifest_path = os.path.join(directory, self.MANIFEST)
+            if os.path.exists(manifest_path):
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    self._generation = json.load(f)["generation"]
+                self.base = CSRGraphStore(self._snapshot_path(self._generation))
+        self._reset()
+
+    def _reset(self):
+        self._base_size = len(self.base) if self.base is not None else 0
+        # Nodes added on top of the snapshot get ordinals after the snapshot's
+        self._node_ids: Dict[str, int] = {}
+        self._node_keys: List[str] = []
+        self._node_data: Dict[int, Any] = {}
+        self._removed: Set[int] = set()
+        self._relation_ids: Dict[str, int] = {}
+        self._relation_names: List[str] = []
+        for relation in (self.base.relations if self.base is not None else ()):
+            self._intern_relation(relation)
+        # (node, relation) -> target nodes; shadows the snapshot for that pair
+        self._edges: Dict[Tuple[int, int], array] = {}
+
+    def _snapshot_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"snapshot-{generation:06d}")
+
+    def __len__(self) -> int:
+        return self._base_size + len(self._node_keys) - len(self._removed)
+
+    def __contains__(self, node_id: str) -> bool:
+        return self._lookup(node_id) is not None
+
+    def _lookup(self, node_id: str) -> Optional[int]:
+        node = self._node_ids.get(node_id)
+        if node is None and self.base is not None:
+            node = self.base.ordinal_of(node_id)
+        if node is None or node in self._removed:
+            return None
+        return node
+
+    def _key(self, node: int) -> str:
+        if node < self._base_size:
+            return self.base.key(node)
+        return self._node_keys[node - self._base_size]
+
+    def _data(self, node: int) -> Any:
+        if node in self._node_data:
+            return self._node_data[node]
+        if node < self._base_size:
+            return self.base.data(node)
+        return None
+
+    def _intern_node(self, node_id: str) -> int:
+        node = self._node_ids.get(node_id)
+        if node is None and self.base is not None:
+            node = self.base.ordinal_of(node_id)
+        if node is None:
+            node = self._node_ids[node_id] = self._base_size + len(self._node_keys)
+            self._node_keys.append(node_id)
+        elif self._removed:
+            self._removed.discard(node)
+        return node
+
+    def _intern_relation(self, relation: str) -> int:
+        rel = self._relation_ids.get(relation)
+        if rel is None:
+            rel = self._relation_ids[relation] = len(self._relation_names)
+            self._relation_names.append(relation)
+        return rel
+
+    def nodes(self) -> Iterator[str]:
+        for node in range(self._base_size + len(self._node_keys)):
+            if node not in self._removed:
+                yield self._key(node)
+
+    def add_node(self, node_id: str, data: Any = None):
+        self._node_data[self._intern_node(node_id)] = data
+
+    def get_node(self, node_id: str) -> Any:
+        node = self._lookup(node_id)
+        return self._data(node) if node is not None else None
+
+    def _edge_list(self, node: int, rel: int) -> array:
+        """Writable target array for (node, rel), copied from the snapshot on first write."""
+        targets = self._edges.get((node, rel))
+        if targets is None:
+            base_targets = []
+            if node < self._base_size and rel < len(self.base.relations):
+                base_targets = self.base.targets(node, rel)
+            targets = self._edges[(node, rel)] = array("l", base_targets)
+        return targets
+
+    def add_edge(self, source_id: str, target_id: str, relation: str):
+        source = self._intern_node(source_id)
+        target = self._intern_node(target_id)
+        targets = self._edge_list(source, self._intern_relation(relation))
+        if target not in targets:
+            targets.append(target)
+
+    def set_neighbors(self, node_id: str, relation: str, target_ids: List[str]):
+        """Replace all `relation` edges of a node, keeping the given order."""
+        source = self._intern_node(node_id)
+        targets = array("l", dict.fromkeys(self._intern_node(t) for t in target_ids))
+        self._edges[(source, self._intern_relation(relation))] = targets
+
+    def remove_node(self, node_id: str) -> bool:
+        """
+        Remove a node, its data and its outgoing edges. Edges pointing at it
+        are the caller's to remove; they are skipped on read meanwhile.
+        """
+        node = self._lookup(node_id)
+        if node is None:
+            return False
+        for rel in range(len(self._relation_names)):
+            if node < self._base_size:
+                self._edges[(node, rel)] = array("l")
+            else:
+                self._edges.pop((node, rel), None)
+        if node < self._base_size:
+            self._node_data[node] = None
+        else:
+            self._node_data.pop(node, None)
+        self._removed.add(node)
+        return True
+
+    def _targets(self, node: int, relation: Optional[str]) -> List[int]:
+        if relation is None:
+            rels = range(len(self._relation_names))
+        else:
+            rel = self._relation_ids.get(relation)
+            rels = (rel,) if rel is not None else ()
+
+        targets: List[int] = []
+        for rel in rels:
+            overlay = self._edges.get((node, rel))
+            if overlay is not None:
+                targets.extend(overlay)
+            elif node < self._base_size and rel < len(self.base.relations):
+                targets.extend(self.base.targets(node, rel))
+        if self._removed:
+            targets = [t for t in targets if t not in self._removed]
+        return targets
+
+    def neighbor_ids(self, node_id: str, relation: str = None) -> List[str]:
+        node = self._lookup(node_id)
+        if node is None:
+            return []
+        return [self._key(t) for t in self._targets(node, relation)]
+
+    def get_neighbors(self, node_id: str, relation: str = None) -> List[Tuple[str, Any]]:
+        node = self._lookup(node_id)
+        if node is None:
+            return []
+        return [(self._key(t), self._data(t)) for t in self._targets(node, relation)]
+
+    def walk(self, node_id: str, relation: str, steps: int) -> List[Tuple[str, Any]]:
+        """
+        Follow the first `relation` edge up to `steps` times (e.g. along a
+        NEXT chain) and return the visited nodes in order, stopping early at
+        the end of the chain or on a cycle.
+        """
+        node = self._lookup(node_id)
+        if node is None or relation not in self._relation_ids:
+            return []
+        visited = []
+        seen = {node}
+        for _ in range(steps):
+            targets = self._targets(node, relation)
+            if not targets or targets[0] in seen:
+                break
+            node = targets[0]
+            seen.add(node)
+            visited.append((self._key(node), self._data(node)))
+        return visited
+
+    def get_path(self, start_node: str, end_node: str, max_depth: int = 3) -> List[str]:
+        """Shortest path of at most `max_depth` edges (BFS with parent pointers), or []."""
+        start = self._lookup(start_node)
+        end = self._lookup(end_node)
+        if start is None or end is None:
+            return []
+        if start == end:
+            return [start_node]
+
+        parents = {start: -1}
+        queue = collections.deque([(start, 0)])
+        while queue:
+            vertex, depth = queue.popleft()
+            if depth >= max_depth:
+                continue
+            for neighbor in self._targets(vertex, None):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = vertex
+                if neighbor == end:
+                    path = []
+                    while neighbor != -1:
+                        path.append(self._key(neighbor))
+                        neighbor = parents[neighbor]
+                    path.reverse()
+                    return path
+                queue.append((neighbor, depth + 1))
+        return []
+
+    def save(self, directory: Optional[str] = None):
+        """
+        Write the whole graph as a new CSR snapshot, point the manifest at
+        it, and continue on top of it. The previous snapshot is then deleted.
+        """
+        if directory is not None and directory != self.directory:
+            self.directory, self._generation = directory, 0
+        if self.directory is None:
+            raise ValueError("No directory to save the graph to")
+        os.makedirs(self.directory, exist_ok=True)
+
+        live = [node for node in range(self._base_size + len(self._node_keys)) if node not in self._removed]
+        position = {node: i for i, node in enumerate(live)}
+        adjacency: List[Dict[int, List[int]]] = []
+        for rel in range(len(self._relation_names)):
+            relation_edges = {}
+            for i, node in enumerate(live):
+                overlay = self._edges.get((node, rel))
+                if overlay is not None:
+                    targets = overlay
+                elif node < self._base_size and rel < len(self.base.relations):
+                    targets = self.base.targets(node, rel)
+                else:
+                    continue
+                if targets:
+                    relation_edges[i] = [position[t] for t in targets if t in position]
+            adjacency.append(relation_edges)
+
+        generation = self._generation + 1
+        snapshot = CSRGraphStore.write(
+            self._snapshot_path(generation),
+            [self._key(node) for node in live],
+            [self._data(node) for node in live],
+            self._relation_names,
+            adjacency
+        )
+
+        manifest_path = os.path.join(self.directory, self.MANIFEST)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": generation}, f)
+        os.replace(tmp_path, manifest_path)
+
+        old_base, old_generation = self.base, self._generation
+        self.base, self._generation = snapshot, generation
+        self._reset()
+        if old_base is not None:
+            old_path = old_base.path
+            old_base.close()
+            if os.path.dirname(old_path) == self.directory and old_generation != generation:
+                shutil.rmtree(old_path, ignore_errors=True)
@@ -0,0 +1,406 @@
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from brainbox.core.knowledge.documents import Document
+
+# --- Variable-byte integer coding -------------------------------------------
+
+def encode_varint(value: int, out: bytearray):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varint(buf, pos: int) -> Tuple[int, int]:
+    """Returns (value, next position)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def _shared_prefix(a: bytes, b: bytes) -> int:
+    limit = min(len(a), len(b))
+    i = 0
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class PostingsCursor:
+    """
+    Forward-only cursor over one term's postings in a DiskSegment.
+
+    Postings are decoded one block at a time; advance() uses the term's
+    skip table to jump over whole blocks without decoding them. `ordinal`
+    is None once the cursor is exhausted.
+    """
+    __slots__ = ("_buf", "_df", "_block_size", "_lasts", "_starts", "_block", "_ordinals", "_tfs", "_i", "ordinal", "tf")
+
+    def __init__(self, buf, offset: int, df: int, block_size: int):
+        self._buf = buf
+        self._df = df
+        self._block_size = block_size
+        # Skip table: last ordinal and byte offset of every block
+        self._lasts: List[int] = []
+        self._starts: List[int] = []
+        pos = offset
+        last = 0
+        sizes = []
+        for _ in range((df + block_size - 1) // block_size):
+            delta, pos = decode_varint(buf, pos)
+            last += delta
+            self._lasts.append(last)
+            size, pos = decode_varint(buf, pos)
+            sizes.append(size)
+        for size in sizes:
+            self._starts.append(pos)
+            pos += size
+
+        self._block = -1
+        self._ordinals: List[int] = []
+        self._tfs: List[int] = []
+        self._i = 0
+        self.ordinal: Optional[int] = None
+        self.tf = 0
+        self._load(0)
+
+    def _load(self, block: int):
+        if block >= len(self._lasts):
+            self.ordinal = None
+            return
+        count = min(self._block_size, self._df - block * self._block_size)
+        buf = self._buf
+        pos = self._starts[block]
+        last = self._lasts[block - 1] if block else 0
+        ordinals = []
+        for _ in range(count):
+            delta, pos = decode_varint(buf, pos)
+            last += delta
+            ordinals.append(last)
+        tfs = []
+        for _ in range(count):
+            tf, pos = decode_varint(buf, pos)
+            tfs.append(tf)
+        self._block = block
+        self._ordinals = ordinals
+        self._tfs = tfs
+        self._i = 0
+        self.ordinal = ordinals[0]
+        self.tf = tfs[0]
+
+    def next(self):
+        self._i += 1
+        if self._i < len(self._ordinals):
+            self.ordinal = self._ordinals[self._i]
+            self.tf = self._tfs[self._i]
+        else:
+            self._load(self._block + 1)
+
+    def advance(self, target: int):
+        """Move to the first posting with ordinal >= target."""
+        if self.ordinal is None or self.ordinal >= target:
+            return
+        if target > self._lasts[self._block]:
+            block = bisect_left(self._lasts, target, self._block + 1)
+            self._load(block)
+            if self.ordinal is None:
+                return
+        self._i = bisect_left(self._ordinals, target, self._i)
+        self.ordinal = self._ordinals[self._i]
+        self.tf = self._tfs[self._i]
+
+
+class DiskSegment:
+    """
+    Immutable on-disk inverted index segment.
+
+    Files in the segment directory:
+    - postings.bin: per term, a skip table (last ordinal and byte size of every
+                    block of POSTINGS_BLOCK postings) followed by the blocks; each
+                    block holds delta + varint coded doc ordinals then varint tfs
+    - terms.bin   : sorted term dictionary in blocks of BLOCK_SIZE terms; within a
+                    block each term is prefix-compressed against the previous one.
+                    Entries carry df, postings offset, max tf and min doc length,
+                    so a term's BM25 upper bound needs no postings access
+    - terms.idx   : first term and byte offset of every block (the only part decoded at open)
+    - docs.jsonl  : one JSON document per ordinal
+    - docs.idx    : uint64 offsets into docs.jsonl followed by uint32 document lengths
+    - ids.bin     : document ids (UTF-8) in sorted order
+    - ids.idx     : uint64 offsets into ids.bin (count + 1) followed by uint32 ordinals
+    - segment.json: format, document count, total length and term count
+
+    Everything else is read lazily through mmap, so opening is near-instant and
+    resident memory is a small fraction of the in-memory InvertedIndex.
+    ordinal_of() binary-searches the sorted id table instead of decoding documents.
+    """
+    FORMAT = 2
+    BLOCK_SIZE = 64
+    POSTINGS_BLOCK = 128
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "segment.json"), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        if info.get("format", 1) != self.FORMAT:
+            raise ValueError(
+                f"Segment at {path} uses format {info.get('format', 1)}, expected {self.FORMAT}; rebuild the index"
+            )
+        self.doc_count: int = info["doc_count"]
+        self.total_length: int = info["total_length"]
+        self.term_count: int = info["term_count"]
+
+        self._files = []
+        self._postings = self._map("postings.bin")
+        self._terms = self._map("terms.bin")
+        self._docs = self._map("docs.jsonl")
+        self._docs_idx = self._map("docs.idx")
+        self._ids = self._map("ids.bin")
+        self._ids_idx = self._map("ids.idx")
+
+        # Block index: first term of each block and where the block starts
+        self._block_terms: List[bytes] = []
+        self._block_offsets: List[int] = []
+        with open(os.path.join(path, "terms.idx"), "rb") as f:
+            raw = f.read()
+        pos = 0
+        while pos < len(raw):
+            length, pos = decode_varint(raw, pos)
+            self._block_terms.append(raw[pos:pos + length])
+            pos += length
+            offset, pos = decode_varint(raw, pos)
+            self._block_offsets.append(offset)
+
+    def _map(self, name: str):
+        f = open(os.path.join(self.path, name), "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        for buf in (self._postings, self._terms, self._docs, self._docs_idx, self._ids, self._ids_idx):
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    # --- Writing ------------------------------------------------------------
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        documents: Iterable[Tuple[Document, Dict[str, int], int]]
+    ) -> "DiskSegment":
+        """
+        Write a segment from (document, term frequencies, document length)
+        triples; ordinals follow iteration order.
+        """
+        os.makedirs(path, exist_ok=True)
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        doc_offsets: List[int] = []
+        doc_lengths: List[int] = []
+        doc_ids: List[bytes] = []
+        total_length = 0
+
+        with open(os.path.join(path, "docs.jsonl"), "wb") as docs_file:
+            position = 0
+            for ordinal, (doc, term_freqs, length) in enumerate(documents):
+                line = json.dumps(
+                    {"id": doc.id, "content": doc.content, "metadata": doc.metadata},
+                    ensure_ascii=False
+                ).encode("utf-8") + b"\n"
+                docs_file.write(line)
+                doc_offsets.append(position)
+                position += len(line)
+                doc_lengths.append(length)
+                doc_ids.append(doc.id.encode("utf-8"))
+                total_length += length
+                for term, tf in term_freqs.items():
+                    entry = postings.get(term)
+                    if entry is None:
+                        entry = postings[term] = ([], [])
+                    entry[0].append(ordinal)
+                    entry[1].append(tf)
+
+        with open(os.path.join(path, "docs.idx"), "wb") as f:
+            f.write(struct.pack(f"<{len(doc_offsets)}Q", *doc_offsets))
+            f.write(struct.pack(f"<{len(doc_lengths)}I", *doc_lengths))
+
+        # Sorted id table for ordinal_of()
+        by_id = sorted(range(len(doc_ids)), key=doc_ids.__getitem__)
+        id_offsets = [0]
+        with open(os.path.join(path, "ids.bin"), "wb") as f:
+            for ordinal in by_id:
+                f.write(doc_ids[ordinal])
+                id_offsets.append(id_offsets[-1] + len(doc_ids[ordinal]))
+        with open(os.path.join(path, "ids.idx"), "wb") as f:
+            f.write(struct.pack(f"<{len(id_offsets)}Q", *id_offsets))
+            f.write(struct.pack(f"<{len(by_id)}I", *by_id))
+
+        terms_buf = bytearray()
+        postings_buf = bytearray()
+        index_buf = bytearray()
+        previous = b""
+        encoded_terms = sorted((term.encode("utf-8"), term) for term in postings)
+
+        for i, (term_bytes, term) in enumerate(encoded_terms):
+            ordinals, tfs = postings[term]
+            if i % cls.BLOCK_SIZE == 0:
+                encode_varint(len(term_bytes), index_buf)
+                index_buf += term_bytes
+                encode_varint(len(terms_buf), index_buf)
+                previous = b""
+
+            # Term entry: shared prefix, suffix, df, postings offset, max tf, min doc length
+            shared = _shared_prefix(previous, term_bytes)
+            encode_varint(shared, terms_buf)
+            encode_varint(len(term_bytes) - shared, terms_buf)
+            terms_buf += term_bytes[shared:]
+            encode_varint(len(ordinals), terms_buf)
+            encode_varint(len(postings_buf), terms_buf)
+            encode_varint(max(tfs), terms_buf)
+            encode_varint(min(doc_lengths[ordinal] for ordinal in ordinals), terms_buf)
+            previous = term_bytes
+
+            skips = bytearray()
+            blocks = bytearray()
+            last = 0
+            for start in range(0, len(ordinals), cls.POSTINGS_BLOCK):
+                block = bytearray()
+                block_last = last
+                for ordinal in ordinals[start:start + cls.POSTINGS_BLOCK]:
+                    encode_varint(ordinal - block_last, block)
+                    block_last = ordinal
+                for tf in tfs[start:start + cls.POSTINGS_BLOCK]:
+                    encode_varint(tf, block)
+                encode_varint(block_last - last, skips)
+                encode_varint(len(block), skips)
+                blocks += block
+                last = block_last
+            postings_buf += skips
+            postings_buf += blocks
+
+        for name, data in (("terms.bin", terms_buf), ("postings.bin", postings_buf), ("terms.idx", index_buf)):
+            with open(os.path.join(path, name), "wb") as f:
+                f.write(data)
+
+        # segment.json is written last: its presence marks a complete segment
+        with open(os.path.join(path, "segment.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "format": cls.FORMAT,
+                "doc_count": len(doc_offsets),
+                "total_length": total_length,
+                "term_count": len(encoded_terms)
+            }, f)
+        return cls(path)
+
+    # --- Reading ------------------------------------------------------------
+
+    def _lookup(self, term: str) -> Optional[Tuple[int, int, int, int]]:
+        """Returns (df, postings offset, max tf, min doc length) for term, or None."""
+        target = term.encode("utf-8")
+        block = bisect_right(self._block_terms, target) - 1
+        if block < 0:
+            return None
+
+        pos = self._block_offsets[block]
+        end = self._block_offsets[block + 1] if block + 1 < len(self._block_offsets) else len(self._terms)
+        current = b""
+        while pos < end:
+            shared, pos = decode_varint(self._terms, pos)
+            suffix_len, pos = decode_varint(self._terms, pos)
+            current = current[:shared] + self._terms[pos:pos + suffix_len]
+            pos += suffix_len
+            df, pos = decode_varint(self._terms, pos)
+            offset, pos = decode_varint(self._terms, pos)
+            max_tf, pos = decode_varint(self._terms, pos)
+            min_length, pos = decode_varint(self._terms, pos)
+            if current == target:
+                return df, offset, max_tf, min_length
+            if current > target:
+                return None
+        return None
+
+    def doc_freq(self, term: str) -> int:
+        found = self._lookup(term)
+        return found[0] if found else 0
+
+    def term_bounds(self, term: str) -> Optional[Tuple[int, int]]:
+        """Returns (max tf, min doc length) over the term's postings, or None."""
+        found = self._lookup(term)
+        return found[2:] if found else None
+
+    def cursor(self, term: str) -> Optional[PostingsCursor]:
+        found = self._lookup(term)
+        if not found:
+            return None
+        return PostingsCursor(self._postings, found[1], found[0], self.POSTINGS_BLOCK)
+
+    def postings(self, term: str) -> Tuple[List[int], List[int]]:
+        """Returns (doc ordinals, term frequencies) for term."""
+        cursor = self.cursor(term)
+        ordinals: List[int] = []
+        tfs: List[int] = []
+        while cursor is not None and cursor.ordinal is not None:
+            # Take the rest of the decoded block at once
+            ordinals.extend(cursor._ordinals[cursor._i:])
+            tfs.extend(cursor._tfs[cursor._i:])
+            cursor._load(cursor._block + 1)
+        return ordinals, tfs
+
+    def iter_terms(self) -> Iterator[str]:
+        pos = 0
+        current = b""
+        end = len(self._terms)
+        while pos < end:
+            shared, pos = decode_varint(self._terms, pos)
+            suffix_len, pos = decode_varint(self._terms, pos)
+            current = current[:shared] + self._terms[pos:pos + suffix_len]
+            pos += suffix_len
+            for _ in range(4):
+                _, pos = decode_varint(self._terms, pos)
+            yield current.decode("utf-8")
+
+    def doc_length(self, ordinal: int) -> int:
+        return struct.unpack_from("<I", self._docs_idx, self.doc_count * 8 + ordinal * 4)[0]
+
+    def document(self, ordinal: int) -> Document:
+        start = struct.unpack_from("<Q", self._docs_idx, ordinal * 8)[0]
+        end = self._docs.find(b"\n", start)
+        raw = json.loads(self._docs[start:end])
+        return Document(id=raw["id"], content=raw["content"], metadata=raw["metadata"])
+
+    def ordinal_of(self, doc_id: str) -> Optional[int]:
+        # Binary search over the sorted id table; nothing is decoded or cached
+        target = doc_id.encode("utf-8")
+        low, high = 0, self.doc_count
+        while low < high:
+            middle = (low + high) // 2
+            start, end = struct.unpack_from("<2Q", self._ids_idx, middle * 8)
+            current = self._ids[start:end]
+            if current == target:
+                return struct.unpack_from("<I", self._ids_idx, (self.doc_count + 1) * 8 + middle * 4)[0]
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def term_frequencies(self) -> List[Dict[str, int]]:
+        """Rebuild per-document term frequencies (used when merging)."""
+        per_doc: List[Dict[str, int]] = [{} for _ in range(self.doc_count)]
+        for term in self.iter_terms():
+            ordinals, tfs = self.postings(term)
+            for ordinal, tf in zip(ordinals, tfs):
+                per_doc[ordinal][term] = tf
+        return per_doc
@@ -1,37 +1,40 @@
-from typing import List
+from typing import List, Optional
 from brainbox.core.knowledge.chunking.base import Chunker
 from brainbox.core.embeddings.base import EmbeddingClient
 from brainbox.core.vectorstore.base import VectorStore
 from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.ingestion.chunk_store import ChunkStore
 
 def index_documents(
     documents: List[Document],
     chunker: Chunker,
     embedding_client: EmbeddingClient,
-    vector_store: VectorStore
-):
+    vector_store: VectorStore,
+    chunk_store: Optional[ChunkStore] = None
+) -> ChunkStore:
     """
     Orchestrates the indexing process: Chunk -> Embed -> Store.
+
+    Chunk metadata are ChunkRecord views into `chunk_store` (a new one when
+    omitted): each document's text and metadata are stored once and shared
+    by its chunks instead of being copied into every chunk.
+    Returns the chunk store.
     """
+    if chunk_store is None:
+        chunk_store = ChunkStore()
+
     texts = []
     metadatas = []
 
     for doc in documents:
         # 1. Chunking
-        chunks = chunker.chunk(doc.content)
-        
-        for i, chunk in enumerate(chunks):
-            texts.append(chunk)
-            # Create richer metadata linking back to parent doc
-            metadatas.append({
-                "doc_id": doc.id,
-                "chunk_id": i,
-                "content": chunk,  # Store content in metadata for retrieval reconstruction
-                **(doc.metadata or {}) # Merge original metadata
-            })
+        chunks = chunker.chunk_with_offsets(doc.content)
+        texts.extend(chunk.text for chunk in chunks)
+        # Records link back to the parent doc (id / parent_id) and carry its metadata
+        metadatas.extend(chunk_store.add_document(doc, chunks))
 
     if not texts:
-        return
+        return chunk_store
 
     # 2. Embedding
     vectors = embedding_client.embed(texts)
@@ -39,3 +42,4 @@ def index_documents(
     # 3. Storage
     vector_store.add(vectors, metadatas)
     print(f"[INDEXER] Indexed {len(vectors)} chunks from {len(documents)} documents.")
+    return chunk_store
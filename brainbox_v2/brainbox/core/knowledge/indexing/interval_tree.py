@@ -0,0 +1,151 @@
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+from brainbox.core.knowledge.chunking.base import TextChunk
+
+@dataclass
+class Segment:
+    start: int  # inclusive
+    end: int    # exclusive
+    data: Any
+
+class _Node:
+    __slots__ = ("starts", "by_start", "ends", "by_end")
+
+    def __init__(self):
+        # The same segments, sorted by start and by end (with parallel key lists for bisect)
+        self.starts: List[int] = []
+        self.by_start: List[Segment] = []
+        self.ends: List[int] = []
+        self.by_end: List[Segment] = []
+
+class IntervalTree:
+    """
+    Centered interval tree over integer offsets, for mapping character
+    positions or ranges (e.g. citation spans) to the chunks that cover them.
+
+    Node centers are fixed dyadic points: every positive integer c is the
+    center at level "trailing zeros of c", so a segment [start, end) is
+    stored at the single center in (start, end] with the most trailing zeros
+    (offsets are shifted by one so 0 is usable). Placement is computed in
+    O(1) and is independent of insertion order, so the tree never needs
+    rebalancing and depth is bounded by the bit length of the largest offset
+    (~27 levels for a 100 MB document). Each node keeps its segments sorted
+    by start and by end, so a query only bisects the nodes on its path.
+
+    - query(point) / query_range(start, end): O(log N + hits)
+    - bulk build: O(n log n); insert: O(log N) plus a list insert at one node
+
+    Empty segments (end <= start) contain no position, so they are skipped,
+    as the original SegmentTree never returned them; negative starts raise.
+    """
+    def __init__(self, segments: Iterable[Segment] = ()):
+        self._nodes: Dict[int, _Node] = {}
+        self._centers: List[int] = []  # sorted, for range enumeration
+        self._levels = 0
+        self._size = 0
+
+        buckets: Dict[int, List[Segment]] = {}
+        for segment in segments:
+            if segment.end > segment.start:
+                buckets.setdefault(self._center_of(segment), []).append(segment)
+        for center, bucket in buckets.items():
+            node = _Node()
+            node.by_start = sorted(bucket, key=lambda s: s.start)
+            node.starts = [s.start for s in node.by_start]
+            node.by_end = sorted(bucket, key=lambda s: s.end)
+            node.ends = [s.end for s in node.by_end]
+            self._nodes[center] = node
+            self._levels = max(self._levels, center.bit_length())
+            self._size += len(bucket)
+        self._centers = sorted(self._nodes)
+
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[TextChunk]) -> "IntervalTree":
+        """Tree over a chunker's output; each segment's data is the TextChunk.
+        Chunks without a source range are left out."""
+        return cls(Segment(chunk.start, chunk.end, chunk) for chunk in chunks if chunk.start is not None)
+
+    @staticmethod
+    def _center_of(segment: Segment) -> int:
+        if segment.start < 0:
+            raise ValueError(f"Invalid segment [{segment.start}, {segment.end}): start must be >= 0")
+        low, high = segment.start + 1, segment.end
+        if low == high:
+            return low
+        shift = (low ^ high).bit_length() - 1
+        return (high >> shift) << shift
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Segment]:
+        for center in self._centers:
+            yield from self._nodes[center].by_start
+
+    def insert(self, segment: Segment):
+        if segment.end <= segment.start:
+            return
+        center = self._center_of(segment)
+        node = self._nodes.get(center)
+        if node is None:
+            node = self._nodes[center] = _Node()
+            insort(self._centers, center)
+            self._levels = max(self._levels, center.bit_length())
+
+        i = bisect_right(node.starts, segment.start)
+        node.starts.insert(i, segment.start)
+        node.by_start.insert(i, segment)
+        i = bisect_right(node.ends, segment.end)
+        node.ends.insert(i, segment.end)
+        node.by_end.insert(i, segment)
+        self._size += 1
+
+    def _path(self, position: int) -> Iterator[int]:
+        """Centers whose nodes may hold segments containing the (shifted) position."""
+        for level in range(self._levels):
+            center = ((position >> (level + 1)) << (level + 1)) | (1 << level)
+            if center in self._nodes:
+                yield center
+
+    def query(self, point: int) -> List[Segment]:
+        """All segments with start <= point < end, ordered by start."""
+        hits: List[Segment] = []
+        if point < 0:
+            return hits
+        shifted = point + 1
+        for center in self._path(shifted):
+            node = self._nodes[center]
+            # Every segment at a node contains its center, so one side is already satisfied
+            if shifted < center:
+                hits.extend(node.by_start[:bisect_right(node.starts, point)])
+            else:
+                hits.extend(node.by_end[bisect_right(node.ends, point):])
+        hits.sort(key=lambda s: (s.start, s.end))
+        return hits
+
+    def query_range(self, start: int, end: int) -> List[Segment]:
+        """All segments overlapping [start, end), ordered by start."""
+        hits: List[Segment] = []
+        start = max(start, 0)
+        if end <= start:
+            return hits
+        low, high = start + 1, end
+
+        # Nodes centered inside the range: all of their segments overlap it
+        first, last = bisect_left(self._centers, low), bisect_right(self._centers, high)
+        for center in self._centers[first:last]:
+            hits.extend(self._nodes[center].by_start)
+        # Nodes left of the range: segments reaching past its start
+        for center in self._path(low):
+            if center < low:
+                node = self._nodes[center]
+                hits.extend(node.by_end[bisect_right(node.ends, start):])
+        # Nodes right of the range: segments beginning before its end
+        for center in self._path(high):
+            if center > high:
+                node = self._nodes[center]
+                hits.extend(node.by_start[:bisect_left(node.starts, end)])
+
+        hits.sort(key=lambda s: (s.start, s.end))
+        return hits
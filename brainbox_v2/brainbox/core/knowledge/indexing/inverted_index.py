@@ -1,31 +1,91 @@
-from typing import Dict, List, Set, Any
-import re
+from typing import Dict, List, Set, Any, Optional, Tuple
+from collections import Counter
+from bisect import bisect_left
+import heapq
+import math
 from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.analysis import Analyzer, default_analyzer
 
 class InvertedIndex:
     """
-    A simple in-memory inverted index.
-    Maps terms -> list of document IDs.
+    An in-memory inverted index with BM25 / BM25+ scoring.
+    Maps terms -> postings {doc_id: term frequency}, and keeps document
+    lengths and corpus statistics so queries only touch the postings of
+    their own terms.
+
+    Top-k queries use WAND dynamic pruning by default: documents whose score
+    upper bound cannot beat the current k-th best are skipped without being
+    scored, which keeps latency flat for queries with very common terms.
+    Both algorithms sum term scores in query order and rank by (score desc,
+    insertion order), so they return the same results, ties included.
+
+    Documents and queries go through the same Analyzer (the shared default
+    unless one is given), so terms are normalized, stopword-filtered and stemmed.
     """
-    def __init__(self):
-        self.index: Dict[str, Set[str]] = {}
+    SCORERS = ("bm25", "bm25+")
+    ALGORITHMS = ("wand", "exhaustive")
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, delta: float = 1.0, analyzer: Optional[Analyzer] = None):
+        self.index: Dict[str, Dict[str, int]] = {}
         self.doc_store: Dict[str, Document] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.total_length = 0
+        # Forward index: doc_id -> distinct terms, so deletes only touch that doc's postings
+        self.doc_terms: Dict[str, Tuple[str, ...]] = {}
+
+        # Monotonic internal doc numbers. Postings dicts preserve insertion order,
+        # so iterating a postings dict visits documents in ascending doc number.
+        self.doc_numbers: Dict[str, int] = {}
+        self._next_doc_number = 0
+        # term -> (doc numbers, doc ids, tfs, doc lengths, max tf, min doc length)
+        self._cursor_cache: Dict[str, tuple] = {}
+
+        # BM25 parameters (delta is only used by BM25+)
+        self.k1 = k1
+        self.b = b
+        self.delta = delta
+        self.analyzer = analyzer or default_analyzer()
 
     def _tokenize(self, text: str) -> List[str]:
-        # Simple tokenization: lowercase and alphanumeric only
-        return re.findall(r'\b\w+\b', text.lower())
+        return self.analyzer.analyze_query(text)
+
+    @property
+    def doc_count(self) -> int:
+        return len(self.doc_store)
+
+    @property
+    def avg_doc_length(self) -> float:
+        return self.total_length / self.doc_count if self.doc_count else 0.0
 
     def add(self, document: Document):
         """
         Add a document to the inverted index.
+        Re-adding an existing id replaces the previous version.
         """
+        if document.id in self.doc_store:
+            self.delete(document.id)
+
         self.doc_store[document.id] = document
-        tokens = self._tokenize(document.content)
-        
-        for token in set(tokens): # Use set to avoid duplicates per doc
+        self.doc_numbers[document.id] = self._next_doc_number
+        self._next_doc_number += 1
+        # Cached per document, so other lexical components reuse the same tokens
+        tokens = self.analyzer.analyze_document(document)
+        self.doc_lengths[document.id] = len(tokens)
+        self.total_length += len(tokens)
+
+        term_freqs = Counter(tokens)
+        self.doc_terms[document.id] = tuple(term_freqs)
+        for token, tf in term_freqs.items():
             if token not in self.index:
-                self.index[token] = set()
-            self.index[token].add(document.id)
+                self.index[token] = {}
+            self.index[token][document.id] = tf
+            self._cursor_cache.pop(token, None)
+
+    def update(self, document: Document):
+        """
+        Replace a document's content; only its old and new postings are touched.
+        """
+        self.add(document)
 
     def retrieve(self, query: str) -> List[Document]:
         """
@@ -34,27 +94,162 @@ class InvertedIndex:
         """
         query_tokens = self._tokenize(query)
         matching_doc_ids = set()
-        
+
         for token in query_tokens:
             if token in self.index:
                 matching_doc_ids.update(self.index[token])
-        
+
         return [self.doc_store[doc_id] for doc_id in matching_doc_ids]
 
+    def idf(self, term: str) -> float:
+        df = len(self.index.get(term, ()))
+        # Lucene-style smoothed IDF, always positive
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        scorer: str = "bm25",
+        algorithm: str = "wand"
+    ) -> List[Tuple[Document, float]]:
+        """
+        Score documents against the query and return the top-k (document, score)
+        pairs, best first. Cost is proportional to the postings of the query terms,
+        and WAND skips most of them when only a few results are requested.
+        """
+        if scorer not in self.SCORERS:
+            raise ValueError(f"Unknown scorer '{scorer}', expected one of {self.SCORERS}")
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {self.ALGORITHMS}")
+        if k <= 0 or not self.doc_store:
+            return []
+
+        query_terms = [(term, qtf) for term, qtf in Counter(self._tokenize(query)).items() if term in self.index]
+        if algorithm == "wand":
+            top = self._search_wand(query_terms, k, scorer)
+        else:
+            top = self._search_exhaustive(query_terms, k, scorer)
+        return [(self.doc_store[doc_id], score) for doc_id, score in top]
+
+    def _term_score(self, tf: int, doc_length: int, avg_len: float, delta: float) -> float:
+        norm = self.k1 * (1 - self.b + self.b * doc_length / avg_len)
+        return tf * (self.k1 + 1) / (tf + norm) + delta
+
+    def _search_exhaustive(self, query_terms, k: int, scorer: str) -> List[Tuple[str, float]]:
+        avg_len = self.avg_doc_length or 1.0
+        delta = self.delta if scorer == "bm25+" else 0.0
+        scores: Dict[str, float] = {}
+
+        # Term-at-a-time accumulation; repeated query terms weigh proportionally
+        for term, qtf in query_terms:
+            weight = qtf * self.idf(term)
+            for doc_id, tf in self.index[term].items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * self._term_score(tf, self.doc_lengths[doc_id], avg_len, delta)
+
+        # Ties go to the earlier-added document, as in WAND
+        numbers = self.doc_numbers
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -numbers[item[0]]))
+
+    def _cursor_arrays(self, term: str) -> tuple:
+        cached = self._cursor_cache.get(term)
+        if cached is None:
+            postings = self.index[term]
+            doc_ids = list(postings)
+            tfs = list(postings.values())
+            lengths = [self.doc_lengths[doc_id] for doc_id in doc_ids]
+            cached = (
+                [self.doc_numbers[doc_id] for doc_id in doc_ids],
+                doc_ids,
+                tfs,
+                lengths,
+                max(tfs),
+                min(lengths)
+            )
+            self._cursor_cache[term] = cached
+        return cached
+
+    def _search_wand(self, query_terms, k: int, scorer: str) -> List[Tuple[str, float]]:
+        avg_len = self.avg_doc_length or 1.0
+        delta = self.delta if scorer == "bm25+" else 0.0
+
+        # One cursor per term: [position, doc numbers, doc ids, tfs, lengths, weight, upper bound, term order]
+        cursors = []
+        for order, (term, qtf) in enumerate(query_terms):
+            numbers, doc_ids, tfs, lengths, max_tf, min_length = self._cursor_arrays(term)
+            weight = qtf * self.idf(term)
+            # BM25 grows with tf and shrinks with length, so (max tf, min length) bounds every posting
+            upper_bound = weight * self._term_score(max_tf, min_length, avg_len, delta)
+            cursors.append([0, numbers, doc_ids, tfs, lengths, weight, upper_bound, order])
+
+        heap: List[Tuple[float, int, str]] = []
+        threshold = 0.0
+
+        while cursors:
+            cursors.sort(key=lambda c: c[1][c[0]])
+
+            # Pivot: first cursor at which the summed upper bounds could beat the threshold
+            bound = 0.0
+            pivot = -1
+            for i, cursor in enumerate(cursors):
+                bound += cursor[6]
+                if bound > threshold:
+                    pivot = i
+                    break
+            if pivot == -1:
+                break
+
+            pivot_doc = cursors[pivot][1][cursors[pivot][0]]
+            if cursors[0][1][cursors[0][0]] == pivot_doc:
+                # Every cursor before the pivot sits on pivot_doc: score it fully
+                matched = []
+                doc_id = None
+                for cursor in cursors:
+                    position, numbers = cursor[0], cursor[1]
+                    if numbers[position] != pivot_doc:
+                        break
+                    doc_id = cursor[2][position]
+                    matched.append((cursor[7], cursor[5] * self._term_score(cursor[3][position], cursor[4][position], avg_len, delta)))
+                    cursor[0] += 1
+                # Summed in query order so scores match the exhaustive path bit for bit
+                score = 0.0
+                for _, contribution in sorted(matched):
+                    score += contribution
+
+                if len(heap) < k:
+                    heapq.heappush(heap, (score, -pivot_doc, doc_id))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, -pivot_doc, doc_id))
+                if len(heap) == k:
+                    threshold = heap[0][0]
+            else:
+                # Skip the lagging cursors straight to the pivot document
+                for cursor in cursors[:pivot]:
+                    cursor[0] = bisect_left(cursor[1], pivot_doc, cursor[0])
+
+            cursors = [cursor for cursor in cursors if cursor[0] < len(cursor[1])]
+
+        top = sorted(heap, key=lambda item: (-item[0], -item[1]))
+        return [(doc_id, score) for score, _, doc_id in top]
+
     def delete(self, doc_id: str):
         """
         Remove a document from the index.
-        Note: This is expensive in a simple inverted index as we have to scan keys.
+        Cost is proportional to the document's distinct terms, not the vocabulary.
         """
         if doc_id not in self.doc_store:
             return
-        
+
         del self.doc_store[doc_id]
-        
-        # Prune index
-        for term, doc_ids in self.index.items():
-            if doc_id in doc_ids:
-                doc_ids.discard(doc_id)
-        
-        # Cleanup empty terms (optional)
-        self.index = {k: v for k, v in self.index.items() if v}
+        del self.doc_numbers[doc_id]
+        self.total_length -= self.doc_lengths.pop(doc_id, 0)
+
+        for term in self.doc_terms.pop(doc_id, ()):
+            self._cursor_cache.pop(term, None)
+            postings = self.index.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            # Drop terms that no longer occur anywhere so df stays exact
+            if not postings:
+                del self.index[term]
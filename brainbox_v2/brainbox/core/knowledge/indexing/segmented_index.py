@@ -0,0 +1,416 @@
+import heapq
+import json
+import math
+import os
+import shutil
+from bisect import bisect_left
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, Optional, Set, Tuple
+from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.analysis import Analyzer
+from brainbox.core.knowledge.indexing.inverted_index import InvertedIndex
+from brainbox.core.knowledge.indexing.disk_segment import DiskSegment
+
+class SegmentedIndex:
+    """
+    Persistent BM25 keyword index made of immutable DiskSegments plus an
+    in-memory InvertedIndex buffer for recent writes.
+
+    - add/delete go to the buffer; older copies in segments are tombstoned
+    - flush() writes the buffer as a new segment
+    - a tiered merge policy combines segments of similar size once
+      `merge_factor` of them accumulate, dropping tombstoned documents
+
+    Opening an existing directory only reads the manifest and each segment's
+    block index, so a large index loads without re-tokenizing anything.
+    search() has the same signature and result shape as InvertedIndex.search
+    and prunes with WAND across the buffer and all segments.
+    Document frequencies still count tombstoned documents until their
+    segment is merged, as in Lucene. Segments store analyzed terms, so an
+    existing directory must be reopened with the analyzer that wrote it.
+    """
+    MANIFEST = "segments.json"
+
+    def __init__(
+        self,
+        directory: str,
+        k1: float = 1.2,
+        b: float = 0.75,
+        delta: float = 1.0,
+        flush_threshold: int = 10000,
+        merge_factor: int = 10,
+        analyzer: Optional[Analyzer] = None
+    ):
+        if merge_factor < 2:
+            raise ValueError("merge_factor must be >= 2")
+        self.directory = directory
+        self.flush_threshold = flush_threshold
+        self.merge_factor = merge_factor
+        self.buffer = InvertedIndex(k1=k1, b=b, delta=delta, analyzer=analyzer)
+
+        self.segments: Dict[str, DiskSegment] = {}
+        self.deletes: Dict[str, Set[int]] = {}
+        self._deleted_length: Dict[str, int] = {}
+        self._next_segment = 0
+
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, self.MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            self._next_segment = manifest["next_segment"]
+            for name in manifest["segments"]:
+                segment = DiskSegment(os.path.join(directory, name))
+                self.segments[name] = segment
+                deleted = set(manifest["deletes"].get(name, ()))
+                self.deletes[name] = deleted
+                self._deleted_length[name] = sum(segment.doc_length(ordinal) for ordinal in deleted)
+
+    # --- Statistics ---------------------------------------------------------
+
+    def _live_docs(self, name: str) -> int:
+        return self.segments[name].doc_count - len(self.deletes[name])
+
+    @property
+    def doc_count(self) -> int:
+        return self.buffer.doc_count + sum(self._live_docs(name) for name in self.segments)
+
+    @property
+    def total_length(self) -> int:
+        return self.buffer.total_length + sum(
+            segment.total_length - self._deleted_length[name] for name, segment in self.segments.items()
+        )
+
+    @property
+    def avg_doc_length(self) -> float:
+        count = self.doc_count
+        return self.total_length / count if count else 0.0
+
+    def doc_freq(self, term: str) -> int:
+        return len(self.buffer.index.get(term, ())) + sum(segment.doc_freq(term) for segment in self.segments.values())
+
+    def idf(self, term: str) -> float:
+        df = self.doc_freq(term)
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    # --- Writes -------------------------------------------------------------
+
+    def add(self, document: Document):
+        """Add a document; re-adding an existing id replaces the previous version."""
+        self._tombstone(document.id)
+        self.buffer.add(document)
+        if self.buffer.doc_count >= self.flush_threshold:
+            self.flush()
+
+    def delete(self, doc_id: str):
+        self.buffer.delete(doc_id)
+        if self._tombstone(doc_id):
+            self._save_manifest()
+
+    def _tombstone(self, doc_id: str) -> bool:
+        changed = False
+        for name, segment in self.segments.items():
+            ordinal = segment.ordinal_of(doc_id)
+            if ordinal is not None and ordinal not in self.deletes[name]:
+                self.deletes[name].add(ordinal)
+                self._deleted_length[name] += segment.doc_length(ordinal)
+                changed = True
+        return changed
+
+    def flush(self):
+        """Write the buffered documents as a new immutable segment."""
+        if not self.buffer.doc_count:
+            self._save_manifest()
+            return
+
+        buffer = self.buffer
+        entries = (
+            (doc, {term: buffer.index[term][doc_id] for term in buffer.doc_terms[doc_id]}, buffer.doc_lengths[doc_id])
+            for doc_id, doc in buffer.doc_store.items()
+        )
+        self._add_segment(DiskSegment.write(os.path.join(self.directory, self._new_segment_name()), entries))
+        self.buffer = InvertedIndex(k1=buffer.k1, b=buffer.b, delta=buffer.delta, analyzer=buffer.analyzer)
+        self._save_manifest()
+        self.maybe_merge()
+
+    def _new_segment_name(self) -> str:
+        name = f"seg_{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def _add_segment(self, segment: DiskSegment):
+        name = os.path.basename(segment.path)
+        self.segments[name] = segment
+        self.deletes[name] = set()
+        self._deleted_length[name] = 0
+
+    def _save_manifest(self):
+        manifest_path = os.path.join(self.directory, self.MANIFEST)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "next_segment": self._next_segment,
+                "segments": list(self.segments),
+                "deletes": {name: sorted(deleted) for name, deleted in self.deletes.items() if deleted}
+            }, f)
+        os.replace(tmp_path, manifest_path)
+
+    # --- Merging ------------------------------------------------------------
+
+    def _tier(self, name: str) -> int:
+        live = max(1, self._live_docs(name))
+        return int(math.log(live, self.merge_factor))
+
+    def maybe_merge(self):
+        """
+        Tiered merge policy: segments are bucketed by log_{merge_factor}(live docs),
+        and any bucket holding merge_factor segments is merged into one. The
+        merged segment may land in the next tier up, so repeat until stable.
+        """
+        while True:
+            tiers: Dict[int, List[str]] = {}
+            for name in self.segments:
+                tiers.setdefault(self._tier(name), []).append(name)
+            full = [names for names in tiers.values() if len(names) >= self.merge_factor]
+            if not full:
+                return
+            self.merge(full[0][:self.merge_factor])
+
+    def merge(self, names: Optional[List[str]] = None):
+        """Merge the named segments (default: all) into one, dropping tombstoned documents."""
+        names = list(self.segments) if names is None else names
+        if len(names) < 2 and not any(self.deletes[name] for name in names):
+            return
+
+        def live_entries():
+            for name in names:
+                segment = self.segments[name]
+                deleted = self.deletes[name]
+                for ordinal, term_freqs in enumerate(segment.term_frequencies()):
+                    if ordinal not in deleted:
+                        yield segment.document(ordinal), term_freqs, segment.doc_length(ordinal)
+
+        merged = DiskSegment.write(os.path.join(self.directory, self._new_segment_name()), live_entries())
+
+        # Swap in the merged segment before removing the inputs, so a crash in
+        # between leaves either the old or the new set referenced by the manifest
+        retired = [self.segments[name] for name in names]
+        for name in names:
+            del self.segments[name]
+            del self.deletes[name]
+            del self._deleted_length[name]
+        self._add_segment(merged)
+        self._save_manifest()
+
+        for segment in retired:
+            segment.close()
+            shutil.rmtree(segment.path, ignore_errors=True)
+
+    def close(self):
+        self.flush()
+        for segment in self.segments.values():
+            segment.close()
+
+    # --- Reads --------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        scorer: str = "bm25",
+        algorithm: str = "wand"
+    ) -> List[Tuple[Document, float]]:
+        """
+        Score buffer and segment postings of the query terms with corpus-wide
+        statistics and return the top-k (document, score) pairs, best first.
+        Only the winning documents are decoded from disk.
+
+        As in InvertedIndex, WAND is the default: every segment stores each
+        term's max tf and min document length, which bound its BM25 score, and
+        segment postings carry a skip table so cursors jump over whole blocks
+        of documents that cannot reach the top-k without decoding them.
+        Both algorithms rank ties by age (older segments first, then the buffer).
+        """
+        if scorer not in InvertedIndex.SCORERS:
+            raise ValueError(f"Unknown scorer '{scorer}', expected one of {InvertedIndex.SCORERS}")
+        if algorithm not in InvertedIndex.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {InvertedIndex.ALGORITHMS}")
+        if k <= 0 or not self.doc_count:
+            return []
+
+        query_terms = list(Counter(self.buffer._tokenize(query)).items())
+        if algorithm == "wand":
+            top = self._search_wand(query_terms, k, scorer)
+        else:
+            top = self._search_exhaustive(query_terms, k, scorer)
+
+        results = []
+        for (name, ref), score in top:
+            doc = self.buffer.doc_store[ref] if name is None else self.segments[name].document(ref)
+            results.append((doc, score))
+        return results
+
+    def _sources(self):
+        """(name, base) per segment in order, then the buffer; bases give one global doc order."""
+        base = 0
+        for name, segment in self.segments.items():
+            yield name, base
+            base += segment.doc_count
+        yield None, base
+
+    def _search_exhaustive(self, query_terms, k: int, scorer: str) -> List[Tuple[tuple, float]]:
+        buffer = self.buffer
+        avg_len = self.avg_doc_length or 1.0
+        delta = buffer.delta if scorer == "bm25+" else 0.0
+
+        # Candidates are keyed by (segment name or None for the buffer, ordinal or doc id)
+        scores: Dict[tuple, float] = {}
+        for term, qtf in query_terms:
+            weight = qtf * self.idf(term)
+            for doc_id, tf in buffer.index.get(term, {}).items():
+                key = (None, doc_id)
+                scores[key] = scores.get(key, 0.0) + weight * buffer._term_score(tf, buffer.doc_lengths[doc_id], avg_len, delta)
+            for name, segment in self.segments.items():
+                deleted = self.deletes[name]
+                ordinals, tfs = segment.postings(term)
+                for ordinal, tf in zip(ordinals, tfs):
+                    if ordinal in deleted:
+                        continue
+                    key = (name, ordinal)
+                    scores[key] = scores.get(key, 0.0) + weight * buffer._term_score(tf, segment.doc_length(ordinal), avg_len, delta)
+
+        position = dict(self._sources())
+        numbers = buffer.doc_numbers
+
+        def rank(item):
+            (name, ref), score = item
+            return score, -(position[name] + (numbers[ref] if name is None else ref))
+
+        return heapq.nlargest(k, scores.items(), key=rank)
+
+    def _search_wand(self, query_terms, k: int, scorer: str) -> List[Tuple[tuple, float]]:
+        buffer = self.buffer
+        avg_len = self.avg_doc_length or 1.0
+        delta = buffer.delta if scorer == "bm25+" else 0.0
+
+        # One cursor per (term, source): [global doc, postings cursor, base, weight, upper bound, term order, source]
+        # Sources cover disjoint ranges of one global doc order, so the usual WAND bounds still hold
+        cursors = []
+        for order, (term, qtf) in enumerate(query_terms):
+            weight = qtf * self.idf(term)
+            for name, base in self._sources():
+                if name is None:
+                    if term not in buffer.index:
+                        continue
+                    numbers, doc_ids, tfs, _, max_tf, min_length = buffer._cursor_arrays(term)
+                    cursor = _ListCursor(numbers, doc_ids, tfs)
+                else:
+                    bounds = self.segments[name].term_bounds(term)
+                    if bounds is None:
+                        continue
+                    max_tf, min_length = bounds
+                    cursor = self.segments[name].cursor(term)
+                upper_bound = weight * buffer._term_score(max_tf, min_length, avg_len, delta)
+                cursors.append([base + cursor.ordinal, cursor, base, weight, upper_bound, order, name])
+
+        heap: List[Tuple[float, int, tuple]] = []
+        threshold = 0.0
+        by_doc = itemgetter(0)
+
+        while cursors:
+            cursors.sort(key=by_doc)
+
+            # Pivot: first cursor at which the summed upper bounds could beat the threshold
+            bound = 0.0
+            pivot = -1
+            for i, entry in enumerate(cursors):
+                bound += entry[4]
+                if bound > threshold:
+                    pivot = i
+                    break
+            if pivot == -1:
+                break
+
+            pivot_doc = cursors[pivot][0]
+            exhausted = False
+            if cursors[0][0] == pivot_doc:
+                # Every cursor before the pivot sits on pivot_doc: score it unless tombstoned
+                name = cursors[0][6]
+                if name is None:
+                    ref = cursors[0][1].doc_id
+                    live = True
+                else:
+                    ref = cursors[0][1].ordinal
+                    live = ref not in self.deletes[name]
+                if live:
+                    length = buffer.doc_lengths[ref] if name is None else self.segments[name].doc_length(ref)
+                matched = []
+                for entry in cursors:
+                    if entry[0] != pivot_doc:
+                        break
+                    cursor = entry[1]
+                    if live:
+                        matched.append((entry[5], entry[3] * buffer._term_score(cursor.tf, length, avg_len, delta)))
+                    cursor.next()
+                    if cursor.ordinal is None:
+                        exhausted = True
+                    else:
+                        entry[0] = entry[2] + cursor.ordinal
+
+                if live:
+                    # Summed in query order so scores match the exhaustive path bit for bit
+                    score = 0.0
+                    for _, contribution in sorted(matched):
+                        score += contribution
+                    item = (score, -pivot_doc, (name, ref))
+                    if len(heap) < k:
+                        heapq.heappush(heap, item)
+                    elif score > heap[0][0]:
+                        heapq.heapreplace(heap, item)
+                    if len(heap) == k:
+                        threshold = heap[0][0]
+            else:
+                # Skip the lagging cursors straight to the pivot document
+                for entry in cursors[:pivot]:
+                    cursor = entry[1]
+                    cursor.advance(pivot_doc - entry[2])
+                    if cursor.ordinal is None:
+                        exhausted = True
+                    else:
+                        entry[0] = entry[2] + cursor.ordinal
+
+            if exhausted:
+                cursors = [entry for entry in cursors if entry[1].ordinal is not None]
+
+        top = sorted(heap, key=lambda item: (-item[0], -item[1]))
+        return [(key, score) for score, _, key in top]
+
+
+class _ListCursor:
+    """PostingsCursor over an in-memory buffer term (InvertedIndex._cursor_arrays)."""
+    __slots__ = ("_numbers", "_doc_ids", "_tfs", "_i", "ordinal", "tf", "doc_id")
+
+    def __init__(self, numbers: List[int], doc_ids: List[str], tfs: List[int]):
+        self._numbers = numbers
+        self._doc_ids = doc_ids
+        self._tfs = tfs
+        self._i = -1
+        self.next()
+
+    def next(self):
+        self._i += 1
+        self._sync()
+
+    def advance(self, target: int):
+        if self.ordinal is not None and self.ordinal < target:
+            self._i = bisect_left(self._numbers, target, self._i)
+            self._sync()
+
+    def _sync(self):
+        if self._i < len(self._numbers):
+            self.ordinal = self._numbers[self._i]
+            self.tf = self._tfs[self._i]
+            self.doc_id = self._doc_ids[self._i]
+        else:
+            self.ordinal = None
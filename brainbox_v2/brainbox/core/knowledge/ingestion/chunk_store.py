@@ -0,0 +1,268 @@
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.chunking.base import TextChunk
+
+# Per-chunk fields, in the order IngestionPipeline has always written them
+_CHUNK_FIELDS = tuple(sys.intern(key) for key in (
+    "id", "content", "parent_id", "chunk_id", "chunk_index", "start_offset", "end_offset"
+))
+_CHUNK_FIELD_SET = frozenset(_CHUNK_FIELDS)
+# Short string metadata values (departments, roles, languages...) repeat across documents
+_INTERN_VALUE_MAX_LEN = 64
+
+
+class ChunkRecord(Mapping):
+    """
+    Read-only metadata view of one stored chunk.
+
+    Behaves like the flat metadata dict IngestionPipeline used to build
+    (parent metadata + id, content, parent_id, chunk_id, chunk_index,
+    start_offset, end_offset), so vector stores and retrievers accept it
+    unchanged, but holds only a store reference and a row number.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ChunkStore", row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def parent_id(self) -> str:
+        return self._store._parent_ids[self._store._parent[self._row]]
+
+    @property
+    def chunk_index(self) -> int:
+        return self._store._chunk_index[self._row]
+
+    @property
+    def chunk_id(self) -> str:
+        return f"{self.parent_id}#{self.chunk_index}"
+
+    @property
+    def content(self) -> str:
+        return self._store._text(self._row)
+
+    @property
+    def start_offset(self) -> Optional[int]:
+        start = self._store._char_start[self._row]
+        return start if start >= 0 else None
+
+    @property
+    def end_offset(self) -> Optional[int]:
+        end = self._store._char_end[self._row]
+        return end if end >= 0 else None
+
+    @property
+    def parent_metadata(self) -> Mapping:
+        return self._store._parent_meta[self._store._parent[self._row]]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _CHUNK_FIELD_SET:
+            if key == "id" or key == "parent_id":
+                return self.parent_id
+            return getattr(self, key)
+        return self.parent_metadata[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.parent_metadata:
+            if key not in _CHUNK_FIELD_SET:
+                yield key
+        yield from _CHUNK_FIELDS
+
+    def __len__(self) -> int:
+        parent = self.parent_metadata
+        return len(_CHUNK_FIELDS) + sum(1 for key in parent if key not in _CHUNK_FIELD_SET)
+
+    def __repr__(self) -> str:
+        return f"ChunkRecord({self.chunk_id!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def to_document(self) -> Document:
+        return Document(id=self.chunk_id, content=self.content, metadata=self.to_dict())
+
+
+class ChunkStore:
+    """
+    Compact in-memory storage for ingested chunks.
+
+    - Each parent document's text is stored once, UTF-8 encoded, in a single
+      bytearray arena. Chunks are byte ranges into it, so overlapping chunks
+      cost no extra text and no per-chunk str objects are kept alive.
+    - Per-chunk fields live in flat typed arrays (a few dozen bytes per chunk).
+    - Parent metadata is stored once per document, with interned keys (and
+      short string values), and shared by reference by all of its chunks.
+    - Records are slotted ChunkRecord views created on demand.
+
+    Removing a document only unlinks it; compact() reclaims its text.
+    """
+    def __init__(self):
+        self._arena = bytearray()
+        self._text_start = array("Q")
+        self._text_end = array("Q")
+        self._char_start = array("q")
+        self._char_end = array("q")
+        self._parent = array("l")
+        self._chunk_index = array("l")
+
+        self._parent_ids: List[str] = []
+        self._parent_meta: List[Dict[str, Any]] = []
+        # Byte range of each parent's full text in the arena
+        self._span_start = array("Q")
+        self._span_end = array("Q")
+        # parent id -> (parent number, first row, chunk count); only live documents
+        self._parent_rows: Dict[str, Tuple[int, int, int]] = {}
+        self._dead_rows = 0
+
+    def __len__(self) -> int:
+        return len(self._parent) - self._dead_rows
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return self._row_of(chunk_id) is not None
+
+    def __iter__(self) -> Iterator[ChunkRecord]:
+        for _, first, count in self._parent_rows.values():
+            for row in range(first, first + count):
+                yield ChunkRecord(self, row)
+
+    def _text(self, row: int) -> str:
+        return self._arena[self._text_start[row]:self._text_end[row]].decode("utf-8")
+
+    @staticmethod
+    def _intern_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        interned = {}
+        for key, value in (metadata or {}).items():
+            if isinstance(value, str) and len(value) <= _INTERN_VALUE_MAX_LEN:
+                value = sys.intern(value)
+            interned[sys.intern(key)] = value
+        return interned
+
+    def _append_text(self, text: str) -> int:
+        start = len(self._arena)
+        self._arena += text.encode("utf-8")
+        return start
+
+    def add_document(self, document: Document, chunks: Sequence[TextChunk]) -> List[ChunkRecord]:
+        """
+        Store a document's chunks and return their records.
+        Re-adding a document id replaces its previous chunks.
+        """
+        self.remove_document(document.id)
+
+        parent = len(self._parent_ids)
+        self._parent_ids.append(document.id)
+        self._parent_meta.append(self._intern_metadata(document.metadata))
+        first_row = len(self._parent)
+
+        content = document.content
+        base = self._append_text(content)
+        self._span_start.append(base)
+        self._span_end.append(len(self._arena))
+
+        # Char -> byte offsets within the parent text, computed in one ordered pass
+        if content.isascii():
+            byte_offset = None
+        else:
+            positions = sorted({p for chunk in chunks if chunk.start is not None for p in (chunk.start, chunk.end)})
+            byte_offset = {}
+            char_pos, byte_pos = 0, 0
+            for position in positions:
+                byte_pos += len(content[char_pos:position].encode("utf-8"))
+                char_pos = position
+                byte_offset[position] = byte_pos
+
+        for i, chunk in enumerate(chunks):
+            if chunk.start is not None and content[chunk.start:chunk.end] == chunk.text:
+                if byte_offset is None:
+                    start, end = base + chunk.start, base + chunk.end
+                else:
+                    start, end = base + byte_offset[chunk.start], base + byte_offset[chunk.end]
+            else:
+                # Chunk text is not a verbatim slice (e.g. enriched with context): store it separately
+                start = self._append_text(chunk.text)
+                end = len(self._arena)
+            self._text_start.append(start)
+            self._text_end.append(end)
+            # -1 marks a chunk without a source range
+            self._char_start.append(-1 if chunk.start is None else chunk.start)
+            self._char_end.append(-1 if chunk.end is None else chunk.end)
+            self._parent.append(parent)
+            self._chunk_index.append(i)
+
+        self._parent_rows[document.id] = (parent, first_row, len(chunks))
+        return [ChunkRecord(self, row) for row in range(first_row, first_row + len(chunks))]
+
+    def remove_document(self, doc_id: str) -> bool:
+        rows = self._parent_rows.pop(doc_id, None)
+        if rows is None:
+            return False
+        self._dead_rows += rows[2]
+        return True
+
+    def _row_of(self, chunk_id: str) -> Optional[int]:
+        parent_id, _, index = chunk_id.rpartition("#")
+        rows = self._parent_rows.get(parent_id)
+        if rows is None or not index.isdigit() or int(index) >= rows[2]:
+            return None
+        return rows[1] + int(index)
+
+    def get(self, chunk_id: str) -> Optional[ChunkRecord]:
+        row = self._row_of(chunk_id)
+        return ChunkRecord(self, row) if row is not None else None
+
+    def chunks_of(self, doc_id: str) -> List[ChunkRecord]:
+        _, first, count = self._parent_rows.get(doc_id, (0, 0, 0))
+        return [ChunkRecord(self, row) for row in range(first, first + count)]
+
+    def compact(self):
+        """
+        Rebuild the arena without the text of removed documents. Rows keep
+        their numbers, so existing ChunkRecords stay valid.
+        """
+        arena = bytearray()
+        text_start = array("Q", bytes(8 * len(self._text_start)))
+        text_end = array("Q", bytes(8 * len(self._text_end)))
+        span_start = array("Q", bytes(8 * len(self._span_start)))
+        span_end = array("Q", bytes(8 * len(self._span_end)))
+
+        live_parents = set()
+        for parent, first, count in self._parent_rows.values():
+            live_parents.add(parent)
+            old_base, old_end = self._span_start[parent], self._span_end[parent]
+            base = len(arena)
+            arena += self._arena[old_base:old_end]
+            span_start[parent], span_end[parent] = base, len(arena)
+            for row in range(first, first + count):
+                old_start, old_stop = self._text_start[row], self._text_end[row]
+                if old_base <= old_start and old_stop <= old_end:
+                    text_start[row] = base + (old_start - old_base)
+                    text_end[row] = base + (old_stop - old_base)
+                else:
+                    text_start[row] = len(arena)
+                    arena += self._arena[old_start:old_stop]
+                    text_end[row] = len(arena)
+
+        for parent in range(len(self._parent_meta)):
+            if parent not in live_parents:
+                self._parent_meta[parent] = {}
+
+        self._arena = arena
+        self._text_start, self._text_end = text_start, text_end
+        self._span_start, self._span_end = span_start, span_end
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held by the store's own buffers (metadata dicts excluded)."""
+        arrays = (
+            self._text_start, self._text_end, self._char_start, self._char_end,
+            self._parent, self._chunk_index, self._span_start, self._span_end
+        )
+        return {
+            "arena_bytes": len(self._arena),
+            "array_bytes": sum(a.itemsize * len(a) for a in arrays),
+            "chunks": len(self),
+            "documents": len(self._parent_rows)
+        }
@@ -1,8 +1,11 @@
+import os
 from typing import List, Optional
 from brainbox.core.knowledge.retrievers.vector import VectorRetriever
 from brainbox.core.knowledge.ingestion.loaders.directory import DirectoryLoader
 from brainbox.core.knowledge.ingestion.loaders.base import FileLoader
 from brainbox.core.knowledge.ingestion.pipeline import IngestionPipeline
+from brainbox.core.knowledge.ingestion.manifest import IngestionManifest
+from brainbox.core.knowledge.ingestion.chunk_store import ChunkStore
 
 # Default Loaders
 from brainbox.core.knowledge.ingestion.loaders.text import TextLoader
@@ -13,11 +16,19 @@ class DirectoryKnowledgeBase:
         self,
         loader: DirectoryLoader,
         ingestion_pipeline: IngestionPipeline,
-        retriever: VectorRetriever
+        retriever: VectorRetriever,
+        manifest: Optional[IngestionManifest] = None
     ):
         self.loader = loader
         self.pipeline = ingestion_pipeline
         self.retriever = retriever
+        self.manifest = manifest
+
+        if manifest is not None and manifest.entries and not getattr(ingestion_pipeline.vector_store, "persistent", False):
+            # The manifest describes chunks that died with the previous process;
+            # trusting it would leave every unchanged file out of the index
+            print(f"[WARN] Vector store is not persistent; ignoring manifest {manifest.path} and re-ingesting everything.")
+            manifest.entries.clear()
 
     @classmethod
     def from_path(
@@ -27,34 +38,106 @@ class DirectoryKnowledgeBase:
         loaders: Optional[List[FileLoader]] = None,
         chunker,
         embedding_client,
-        vector_store
+        vector_store,
+        manifest_path: Optional[str] = None,
+        workers: Optional[int] = 0,
+        chunk_store: Optional[ChunkStore] = None
     ):
         """
         Seamlessly creates a RAG-ready Knowledge Base from a directory.
+
+        With a manifest_path the knowledge base is incremental: only added or
+        modified files are re-ingested and chunks of removed files are deleted.
+        This only pays off with a persistent vector store (e.g. MmapVectorStore);
+        with an in-memory store the manifest is ignored and everything is re-ingested.
+
+        Otherwise files are streamed into the ingestion pipeline at constant
+        memory. By default they are parsed in-process; pass `workers` to parse
+        them on that many processes (None = one per CPU).
+
+        Chunk metadata are kept in `chunk_store` so each document's text and
+        metadata are stored once rather than copied into every chunk. When
+        omitted, one is created for non-persistent vector stores; persistent
+        stores serialize the metadata and do not need it.
         """
         # 1. Setup Loaders (Use defaults if none provided)
         if loaders is None:
             loaders = [TextLoader(), MarkdownLoader()]
-            
-        loader = DirectoryLoader(loaders)
-        
-        # 2. Load Documents
-        print(f"🌟 Loading knowledge from: {path}")
-        docs = loader.load(path)
-        print(f"📄 Found {len(docs)} documents.")
 
-        # 3. Ingest
+        if chunk_store is None and not getattr(vector_store, "persistent", False):
+            chunk_store = ChunkStore()
+
+        loader = DirectoryLoader(loaders)
         ingestion = IngestionPipeline(
             chunker=chunker,
             embedding_client=embedding_client,
-            vector_store=vector_store
+            vector_store=vector_store,
+            chunk_store=chunk_store
         )
-        ingestion.ingest(docs)
-
-        # 4. Create Retriever
         retriever = VectorRetriever(embedding_client, vector_store)
 
+        if manifest_path:
+            kb = cls(loader, ingestion, retriever, manifest=IngestionManifest(manifest_path))
+            kb.sync(path)
+            return kb
+
+        # 2. Load + Ingest (streamed)
+        print(f"🌟 Loading knowledge from: {path}")
+        stats = ingestion.ingest_stream(loader.iter_documents(path, workers=workers))
+        print(f"📄 Found {stats['documents']} documents.")
+
+        # 3. Build Knowledge Base
         return cls(loader, ingestion, retriever)
 
+    def sync(self, path: str):
+        """
+        Bring the vector store in line with the directory using the manifest.
+        """
+        if self.manifest is None:
+            raise ValueError("sync() requires a knowledge base created with a manifest_path")
+        if not os.path.isdir(path):
+            print(f"[WARN] Directory not found: {path}")
+            return
+
+        print(f"🌟 Syncing knowledge from: {path}")
+        seen = set()
+        changed = []
+        stale_ids: List[str] = []
+
+        for file_path in self.loader.iter_files(path):
+            seen.add(file_path)
+            entry = self.manifest.check(file_path)
+            if entry is None:
+                continue
+            # Modified file: its old chunks go before it is re-ingested
+            previous = self.manifest.remove(file_path)
+            if previous:
+                stale_ids.extend(previous.chunk_ids)
+            changed.append((file_path, entry))
+
+        removed = [file_path for file_path in self.manifest.entries if file_path not in seen]
+        for file_path in removed:
+            stale_ids.extend(self.manifest.remove(file_path).chunk_ids)
+
+        # One delete for the whole sync; a delete may rewrite the entire store
+        if stale_ids:
+            self.pipeline.vector_store.delete(stale_ids)
+            self._forget_chunks(stale_ids)
+
+        for file_path, entry in changed:
+            chunk_ids = self.pipeline.ingest(self.loader.load_file(file_path))
+            entry.chunk_ids = [chunk_id for ids in chunk_ids.values() for chunk_id in ids]
+            self.manifest.record(file_path, entry)
+
+        self.manifest.save()
+        print(f"📄 {len(changed)} added/modified, {len(removed)} removed, {len(seen) - len(changed)} unchanged.")
+
+    def _forget_chunks(self, chunk_ids: List[str]):
+        # Drop the parents of deleted chunks from the pipeline's chunk store, if any
+        chunk_store = self.pipeline.chunk_store
+        if chunk_store is not None:
+            for parent_id in {chunk_id.rpartition("#")[0] for chunk_id in chunk_ids}:
+                chunk_store.remove_document(parent_id)
+
     def as_retriever(self):
         return self.retriever
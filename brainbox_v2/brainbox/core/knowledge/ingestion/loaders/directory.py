@@ -1,12 +1,39 @@
 import os
-from typing import List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
 from .base import FileLoader
 from brainbox.core.knowledge import Document
 
+def _load_with(loader: FileLoader, path: str) -> List[Document]:
+    # Module-level so it can be pickled into worker processes
+    return loader.load(path)
+
 class DirectoryLoader:
     def __init__(self, loaders: List[FileLoader]):
         self.loaders = loaders
 
+    def find_loader(self, path: str) -> Optional[FileLoader]:
+        for loader in self.loaders:
+            if loader.can_load(path):
+                # First loader that claims the file wins
+                return loader
+        return None
+
+    def iter_files(self, directory: str) -> Iterator[str]:
+        """
+        Yield every file under directory that one of the loaders can handle.
+        """
+        for root, _, files in os.walk(directory):
+            for file in files:
+                path = os.path.join(root, file)
+                if self.find_loader(path) is not None:
+                    yield path
+
+    def load_file(self, path: str) -> List[Document]:
+        loader = self.find_loader(path)
+        return loader.load(path) if loader else []
+
     def load(self, directory: str) -> List[Document]:
         documents = []
         
@@ -14,15 +41,42 @@ class DirectoryLoader:
             print(f"[WARN] Directory not found: {directory}")
             return []
 
-        for root, _, files in os.walk(directory):
-            for file in files:
-                path = os.path.join(root, file)
-
-                for loader in self.loaders:
-                    if loader.can_load(path):
-                        docs = loader.load(path)
-                        documents.extend(docs)
-                        break 
-                        # Stop checking loaders once one has claimed the file
+        for path in self.iter_files(directory):
+            documents.extend(self.load_file(path))
         
         return documents
+
+    def iter_documents(
+        self,
+        directory: str,
+        workers: Optional[int] = 0,
+        max_pending: Optional[int] = None
+    ) -> Iterator[Document]:
+        """
+        Stream documents instead of materializing the whole directory.
+
+        Files are parsed in-process by default, or on a pool of `workers`
+        processes (None = CPU count). At most `max_pending` files are in
+        flight, so memory stays bounded no matter how large the tree is.
+        Documents are yielded in directory-walk order.
+        """
+        if not os.path.isdir(directory):
+            print(f"[WARN] Directory not found: {directory}")
+            return
+
+        if workers == 0:
+            for path in self.iter_files(directory):
+                yield from self.load_file(path)
+            return
+
+        workers = workers or os.cpu_count() or 1
+        max_pending = max_pending or workers * 4
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for path in self.iter_files(directory):
+                pending.append(pool.submit(_load_with, self.find_loader(path), path))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
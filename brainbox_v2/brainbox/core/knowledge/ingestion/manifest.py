@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional
+
+@dataclass
+class ManifestEntry:
+    mtime: float
+    size: int
+    content_hash: str
+    chunk_ids: List[str] = field(default_factory=list)
+
+class IngestionManifest:
+    """
+    Records what has been ingested from each file: (path, mtime, size,
+    content hash) -> chunk ids. Used to only re-process files that were
+    added or modified, and to delete the chunks of removed files.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, ManifestEntry] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            self.entries = {file_path: ManifestEntry(**entry) for file_path, entry in raw.items()}
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def check(self, path: str) -> Optional[ManifestEntry]:
+        """
+        Returns None if the file is unchanged since it was recorded, otherwise
+        a fresh entry (without chunk ids) describing its current state.
+        """
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+
+        # Cheap check first: identical mtime and size means unchanged
+        if entry and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+            return None
+
+        content_hash = self.hash_file(path)
+        if entry and entry.content_hash == content_hash:
+            # Touched but not modified; refresh the stat so the next check stays cheap
+            entry.mtime = stat.st_mtime
+            entry.size = stat.st_size
+            return None
+
+        return ManifestEntry(mtime=stat.st_mtime, size=stat.st_size, content_hash=content_hash)
+
+    def record(self, path: str, entry: ManifestEntry):
+        self.entries[path] = entry
+
+    def remove(self, path: str) -> Optional[ManifestEntry]:
+        return self.entries.pop(path, None)
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({file_path: asdict(entry) for file_path, entry in self.entries.items()}, f)
+        os.replace(tmp_path, self.path)
@@ -1,5 +1,9 @@
-from typing import List, Optional
+import queue
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
 from brainbox.core.knowledge import Document
+from brainbox.core.knowledge.ingestion.chunk_store import ChunkStore
 # Helper types (using existing interfaces or defining typed protocols)
 # Assuming Chunker, EmbeddingClient, VectorStore follow the core interfaces
 
@@ -8,16 +12,49 @@ class IngestionPipeline:
         self,
         chunker,
         embedding_client,
-        vector_store
+        vector_store,
+        chunk_store: Optional[ChunkStore] = None
     ):
         self.chunker = chunker
         self.embedding_client = embedding_client
         self.vector_store = vector_store
+        # When set, chunk metadata handed to the vector store are compact
+        # ChunkRecord views instead of per-chunk dict copies
+        self.chunk_store = chunk_store
 
-    def ingest(self, documents: List[Document]):
+    def _chunk_document(self, doc: Document):
+        text_chunks = self.chunker.chunk_with_offsets(doc.content)
+        if self.chunk_store is not None:
+            return [chunk.text for chunk in text_chunks], self.chunk_store.add_document(doc, text_chunks)
+
+        chunks = []
+        metadatas = []
+        for i, chunk in enumerate(text_chunks):
+            chunks.append(chunk.text)
+            # Combine doc metadata with chunk text for storage
+            meta = doc.metadata.copy() if doc.metadata else {}
+            meta.update({
+                "id": doc.id,
+                "content": chunk.text, 
+                "parent_id": doc.id,
+                "chunk_id": f"{doc.id}#{i}",
+                "chunk_index": i,
+                # Character range in the parent document, for citations
+                "start_offset": chunk.start,
+                "end_offset": chunk.end
+            })
+            metadatas.append(meta)
+        return chunks, metadatas
+
+    def ingest(self, documents: List[Document]) -> Dict[str, List[str]]:
+        """
+        Chunk, embed and store documents.
+        Returns the chunk ids written for each document id.
+        """
+        chunk_ids: Dict[str, List[str]] = {}
         if not documents:
             print("[INFO] No documents to ingest.")
-            return
+            return chunk_ids
 
         chunks = []
         metadatas = []
@@ -25,21 +62,14 @@ class IngestionPipeline:
         print(f"[INGEST] Processing {len(documents)} documents...")
 
         for doc in documents:
-            doc_chunks = self.chunker.chunk(doc.content)
-            for chunk_text in doc_chunks:
-                chunks.append(chunk_text)
-                # Combine doc metadata with chunk text for storage
-                meta = doc.metadata.copy() if doc.metadata else {}
-                meta.update({
-                    "id": doc.id,
-                    "content": chunk_text, 
-                    "parent_id": doc.id
-                })
-                metadatas.append(meta)
+            doc_chunks, doc_metadatas = self._chunk_document(doc)
+            chunk_ids[doc.id] = [meta["chunk_id"] for meta in doc_metadatas]
+            chunks.extend(doc_chunks)
+            metadatas.extend(doc_metadatas)
 
         if not chunks:
             print("[INFO] No chunks generated.")
-            return
+            return chunk_ids
 
         print(f"[INGEST] Embedding {len(chunks)} chunks...")
         vectors = self.embedding_client.embed(chunks)
@@ -47,3 +77,99 @@ class IngestionPipeline:
         print(f"[INGEST] Storing in Vector Store...")
         self.vector_store.add(vectors, metadatas)
         print("[INGEST] Complete.")
+        return chunk_ids
+
+    def ingest_stream(
+        self,
+        documents: Iterable[Document],
+        batch_size: int = 256,
+        max_queued_batches: int = 4,
+        on_document: Optional[Callable[[str, List[str]], None]] = None
+    ) -> Dict[str, int]:
+        """
+        Constant-memory variant of ingest() for arbitrarily large sources.
+
+        Documents are chunked as they arrive and grouped into batches of
+        `batch_size` chunks. A background thread embeds and stores each batch
+        while the next one is being chunked; the bounded queue between the two
+        stages caps how many batches are held in memory at once.
+
+        Nothing proportional to the corpus is kept. Pass `on_document` to
+        receive (doc_id, chunk_ids) for each document; it is called from the
+        background thread once all of that document's chunks are stored.
+        Returns the number of documents and chunks ingested.
+        """
+        batches: "queue.Queue" = queue.Queue(maxsize=max_queued_batches)
+        errors: List[BaseException] = []
+        stats = {"documents": 0, "chunks": 0}
+
+        def embed_and_store():
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                if errors:
+                    # Keep draining so the producer never blocks on a dead consumer
+                    continue
+                texts, metadatas, finished = batch
+                try:
+                    if texts:
+                        vectors = self.embedding_client.embed(texts)
+                        self.vector_store.add(vectors, metadatas)
+                    if on_document is not None:
+                        for doc_id, doc_chunk_ids in finished:
+                            on_document(doc_id, doc_chunk_ids)
+                except BaseException as e:
+                    errors.append(e)
+
+        worker = threading.Thread(target=embed_and_store, daemon=True)
+        worker.start()
+
+        texts: List[str] = []
+        metadatas: List[dict] = []
+        # Documents whose last chunk is not yet in a queued batch, as (chunk end, id, chunk ids)
+        unfinished: "deque" = deque()
+
+        def take_finished(queued: int):
+            finished = []
+            while unfinished and unfinished[0][0] <= queued:
+                _, doc_id, doc_chunk_ids = unfinished.popleft()
+                finished.append((doc_id, doc_chunk_ids))
+            return finished
+
+        try:
+            for doc in documents:
+                if errors:
+                    break
+                stats["documents"] += 1
+                doc_chunks, doc_metadatas = self._chunk_document(doc)
+                texts.extend(doc_chunks)
+                metadatas.extend(doc_metadatas)
+                if on_document is not None:
+                    chunk_end = stats["chunks"] + len(texts)
+                    unfinished.append((chunk_end, doc.id, [meta["chunk_id"] for meta in doc_metadatas]))
+
+                start = 0
+                while len(texts) - start >= batch_size:
+                    stats["chunks"] += batch_size
+                    batches.put((
+                        texts[start:start + batch_size],
+                        metadatas[start:start + batch_size],
+                        take_finished(stats["chunks"])
+                    ))
+                    start += batch_size
+                if start:
+                    texts, metadatas = texts[start:], metadatas[start:]
+
+            if (texts or unfinished) and not errors:
+                stats["chunks"] += len(texts)
+                batches.put((texts, metadatas, take_finished(stats["chunks"])))
+        finally:
+            batches.put(None)
+            worker.join()
+
+        if errors:
+            raise errors[0]
+
+        print(f"[INGEST] Streamed {stats['chunks']} chunks from {stats['documents']} documents.")
+        return stats
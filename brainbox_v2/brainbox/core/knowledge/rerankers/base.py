@@ -1,8 +1,17 @@
 from abc import ABC, abstractmethod
 from typing import List
 from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.scored_hit import ScoredHit
 
 class Reranker(ABC):
     @abstractmethod
     def rerank(self, query: str, documents: List[Document]) -> List[Document]:
         pass
+
+    def rerank_hits(self, query: str, hits: List[ScoredHit]) -> List[ScoredHit]:
+        """
+        Rerank immutable hits. The default runs rerank() on private Document
+        copies, so rerankers that score in place never touch shared documents.
+        """
+        reranked = self.rerank(query, [hit.to_document() for hit in hits])
+        return [ScoredHit.from_document(doc) for doc in reranked]
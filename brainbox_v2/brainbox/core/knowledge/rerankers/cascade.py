@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from brainbox.core.knowledge.rerankers.base import Reranker
+
+@dataclass
+class CascadeStage:
+    """
+    One stage of a CompositeRetriever reranking cascade.
+    After reranking, the stage keeps the best `keep_fraction` of its
+    candidates (never fewer than the requested k).
+    """
+    name: str
+    reranker: Reranker
+    keep_fraction: float = 0.5
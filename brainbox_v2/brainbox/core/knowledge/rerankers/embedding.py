@@ -0,0 +1,32 @@
+from typing import List
+import numpy as np
+from brainbox.core.knowledge.rerankers.base import Reranker
+from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.scored_hit import ScoredHit
+from brainbox.core.embeddings.base import EmbeddingClient
+
+class EmbeddingReranker(Reranker):
+    """
+    Mid-cost cascade stage: cosine similarity between the query and each
+    candidate's embedding. Wrap the client in a CachedEmbeddingClient so
+    chunk embeddings computed at ingestion are reused instead of recomputed.
+    """
+    def __init__(self, embedding_client: EmbeddingClient):
+        self.embedding_client = embedding_client
+
+    def rerank(self, query: str, documents: List[Document]) -> List[Document]:
+        hits = self.rerank_hits(query, [ScoredHit.from_document(doc) for doc in documents])
+        return [hit.to_document() for hit in hits]
+
+    def rerank_hits(self, query: str, hits: List[ScoredHit]) -> List[ScoredHit]:
+        if not hits:
+            return []
+        vectors = np.asarray(self.embedding_client.embed([query] + [hit.content for hit in hits]), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        vectors /= norms[:, None]
+        similarities = vectors[1:] @ vectors[0]
+
+        reranked = [hit.with_score(float(similarity)) for hit, similarity in zip(hits, similarities)]
+        reranked.sort(key=lambda h: h.score, reverse=True)
+        return reranked
@@ -0,0 +1,39 @@
+import math
+from typing import Dict, List, Optional
+from brainbox.core.knowledge.rerankers.base import Reranker
+from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.scored_hit import ScoredHit
+from brainbox.core.knowledge.analysis import Analyzer, default_analyzer
+
+class LexicalReranker(Reranker):
+    """
+    Cheap first cascade stage: scores each candidate by the IDF-weighted
+    share of query terms it contains, with IDF taken over the candidate
+    pool itself. Reuses the analyzer's cached document tokens, so it costs
+    little more than a set intersection per candidate.
+    """
+    def __init__(self, analyzer: Optional[Analyzer] = None):
+        self.analyzer = analyzer or default_analyzer()
+
+    def rerank(self, query: str, documents: List[Document]) -> List[Document]:
+        hits = self.rerank_hits(query, [ScoredHit.from_document(doc) for doc in documents])
+        return [hit.to_document() for hit in hits]
+
+    def rerank_hits(self, query: str, hits: List[ScoredHit]) -> List[ScoredHit]:
+        query_terms = set(self.analyzer.analyze_query(query))
+        if not hits or not query_terms:
+            return list(hits)
+
+        matched = [query_terms.intersection(self.analyzer.analyze_document(hit.source)) for hit in hits]
+        df: Dict[str, int] = {term: 0 for term in query_terms}
+        for terms in matched:
+            for term in terms:
+                df[term] += 1
+        n = len(hits)
+        idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+        total = sum(idf.values()) or 1.0
+
+        # Stable sort: ties keep the incoming (fused) order
+        reranked = [hit.with_score(sum(idf[t] for t in terms) / total) for hit, terms in zip(hits, matched)]
+        reranked.sort(key=lambda h: h.score, reverse=True)
+        return reranked
@@ -1,23 +1,32 @@
-from typing import List
+from typing import List, Optional
 from brainbox.core.knowledge.rerankers.base import Reranker
 from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.scored_hit import ScoredHit
+from brainbox.core.knowledge.analysis import Analyzer, default_analyzer
 
 class LLMReranker(Reranker):
-    def __init__(self, client):
+    def __init__(self, client, analyzer: Optional[Analyzer] = None):
         self.client = client
+        self.analyzer = analyzer or default_analyzer()
 
     def rerank(self, query: str, documents: List[Document]) -> List[Document]:
+        # Returns re-scored copies; the input documents are left untouched
+        hits = self.rerank_hits(query, [ScoredHit.from_document(doc) for doc in documents])
+        return [hit.to_document() for hit in hits]
+
+    def rerank_hits(self, query: str, hits: List[ScoredHit]) -> List[ScoredHit]:
         # Simple heuristic for now:
         # boost docs containing key terms
-        query_terms = set(query.lower().split())
+        query_terms = set(self.analyzer.analyze_query(query))
 
-        for doc in documents:
+        reranked = []
+        for hit in hits:
             # Simple content overlap check
-            doc_terms = set(doc.content.lower().split())
+            doc_terms = set(self.analyzer.analyze_document(hit.source))
             overlap = len(query_terms & doc_terms)
             # Boost score
-            doc.score += overlap * 0.1
+            reranked.append(hit.with_score(hit.score + overlap * 0.1))
 
         # Re-sort desc
-        documents.sort(key=lambda d: d.score, reverse=True)
-        return documents
+        reranked.sort(key=lambda h: h.score, reverse=True)
+        return reranked
@@ -1,8 +1,43 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from brainbox.core.knowledge.documents import Document
+from brainbox.core.knowledge.scored_hit import ScoredHit
 
-@dataclass
 class RetrievalResult:
-    documents: List[Document]
-    signals: Dict[str, Any]   # scores, diagnostics, retriever stats
+    """
+    Ranked retrieval output plus diagnostics.
+
+    Retrievers build it from immutable ScoredHits. `documents` materializes
+    fresh Document copies of those hits on first access, so only results a
+    caller actually reads are copied and editing them never touches the
+    shared corpus. Building a result from documents still works; the hits
+    are then derived from them.
+    """
+    __slots__ = ("signals", "_hits", "_documents")
+
+    def __init__(
+        self,
+        documents: Optional[List[Document]] = None,
+        signals: Optional[Dict[str, Any]] = None,   # scores, diagnostics, retriever stats
+        hits: Optional[List[ScoredHit]] = None
+    ):
+        self.signals = signals if signals is not None else {}
+        self._hits = hits
+        self._documents = documents
+        if hits is None and documents is None:
+            self._hits = []
+            self._documents = []
+
+    @property
+    def hits(self) -> List[ScoredHit]:
+        if self._hits is None:
+            self._hits = [ScoredHit.from_document(doc) for doc in self._documents]
+        return self._hits
+
+    @property
+    def documents(self) -> List[Document]:
+        if self._documents is None:
+            self._documents = [hit.to_document() for hit in self._hits]
+        return self._documents
+
+    def __repr__(self) -> str:
+        return f"RetrievalResult(hits={self.hits!r}, signals={self.signals!r})"
@@ -1,96 +1,389 @@
-from typing import List, Dict, Any, Optional
-from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+import math
+import threading
+import time
 from brainbox.core.knowledge.retrievers import BaseRetriever
-from brainbox.core.knowledge.documents import Document
 from brainbox.core.knowledge.retrieval_result import RetrievalResult
+from brainbox.core.knowledge.scored_hit import ScoredHit
 from brainbox.core.knowledge.rerankers.base import Reranker
+from brainbox.core.knowledge.rerankers.cascade import CascadeStage
 
 class CompositeRetriever(BaseRetriever):
+    """
+    Fans a query out to several retrievers concurrently, fuses their ranked
+    lists, then optionally reranks and normalizes the merged pool.
+
+    Each child runs on a shared thread pool under its own timeout
+    (`timeouts[name]`, else `default_timeout`), capped by the global
+    `latency_budget` (seconds). A child that misses its deadline or raises is
+    skipped and the query is answered from the children that did respond;
+    `signals["components"][name]` records each child's status and latency.
+    Python threads cannot be killed, so a child that overran its deadline
+    keeps its worker until it returns; while it does, that child is skipped
+    (status "busy") instead of being queued again. With the default pool of
+    two workers per child, stragglers can never starve the healthy children.
+    Call close() (or use the retriever as a context manager) to release the pool.
+
+    Fusion modes (default `fusion`, overridable per call):
+    - "max"   : de-duplicate keeping the best raw score
+    - "rrf"   : reciprocal rank fusion, sum of weight / (rrf_k + rank)
+    - "zscore": sum of weighted per-retriever z-scores of the raw scores
+    - "convex": convex combination of per-retriever min-max normalized scores
+    `weights` are keyed by retriever class name and default to 1.0.
+
+    With `early_stop`, RRF fetches shallow lists first and only deepens them
+    (doubling up to `overfetch`) while documents further down could still
+    change the fused top-k. If every child fails in a deepening round, the
+    lists from the previous round are used. The score-based modes need the
+    full lists, as their normalization depends on list depth.
+
+    Instead of a single `reranker`, a `cascade` of CascadeStages (e.g.
+    lexical -> embedding -> cross-encoder) can rerank the pool: each stage
+    keeps only its best `keep_fraction` of candidates for the next, so
+    expensive stages only see plausible candidates. Opting into
+    `cascade_early_exit` also stops the cascade once a stage leaves the
+    top-k unchanged; that saves the costlier stages but means they may
+    never run, so it is off by default.
+    Per-stage counts and latency are reported in `signals["cascade"]`.
+
+    Children's results are consumed as immutable ScoredHits; provenance and
+    every re-scoring produce new hits, so shared documents are never mutated
+    and only the final top-k is materialized into Document copies.
+    """
+    FUSION_MODES = ("max", "rrf", "zscore", "convex")
+
     def __init__(
-        self, 
-        retrievers: List[BaseRetriever], 
+        self,
+        retrievers: List[BaseRetriever],
         reranker: Optional[Reranker] = None,
-        overfetch: int = 20
+        overfetch: int = 20,
+        default_timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        latency_budget: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        fusion: str = "max",
+        weights: Optional[Dict[str, float]] = None,
+        rrf_k: int = 60,
+        early_stop: bool = False,
+        cascade: Optional[List[CascadeStage]] = None,
+        cascade_early_exit: bool = False
     ):
+        if fusion not in self.FUSION_MODES:
+            raise ValueError(f"Unknown fusion '{fusion}', expected one of {self.FUSION_MODES}")
+        if reranker is not None and cascade:
+            raise ValueError("Pass either a reranker or a cascade, not both; use the reranker as the cascade's last stage")
         self.retrievers = retrievers
         self.reranker = reranker
         self.overfetch = overfetch
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        self.latency_budget = latency_budget
+        self.fusion = fusion
+        self.weights = weights or {}
+        self.rrf_k = rrf_k
+        self.early_stop = early_stop
+        self.cascade = cascade or []
+        self.cascade_early_exit = cascade_early_exit
+        # One worker per child for the current query plus one per possible straggler
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(4, 2 * len(retrievers)),
+            thread_name_prefix="composite-retriever"
+        )
+        # Children whose abandoned call is still running, by index
+        self._stragglers: Set[int] = set()
+        self._stragglers_lock = threading.Lock()
+
+    def close(self):
+        """Release the worker pool; running stragglers are not waited for."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "CompositeRetriever":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _abandon(self, i: int, future: Future):
+        # Track a timed-out call that is still running until its worker frees up
+        with self._stragglers_lock:
+            self._stragglers.add(i)
+
+        def release(_):
+            with self._stragglers_lock:
+                self._stragglers.discard(i)
+        future.add_done_callback(release)
+
+    def _fan_out(
+        self,
+        query: str,
+        depth: int,
+        indices: List[int],
+        start_time: float,
+        signals: Dict[str, Any]
+    ) -> Dict[int, RetrievalResult]:
+        """Runs the given children concurrently; returns the results that arrived in time, by index."""
+        names = [retriever.__class__.__name__ for retriever in self.retrievers]
+        budget_deadline = start_time + self.latency_budget if self.latency_budget is not None else None
+
+        futures: Dict[Future, int] = {}
+        deadlines: Dict[Future, Optional[float]] = {}
+        with self._stragglers_lock:
+            busy = set(self._stragglers)
+        for i in indices:
+            if i in busy:
+                # Still stuck in an earlier call; give up on it rather than queue behind it
+                signals["components"][names[i]] = {"status": "busy", "latency_ms": 0.0}
+                continue
+            future = self._executor.submit(self._timed_retrieve, self.retrievers[i], query, depth)
+            timeout = self.timeouts.get(names[i], self.default_timeout)
+            deadline = start_time + timeout if timeout is not None else None
+            if budget_deadline is not None:
+                deadline = budget_deadline if deadline is None else min(deadline, budget_deadline)
+            futures[future] = i
+            deadlines[future] = deadline
+
+        results: Dict[int, RetrievalResult] = {}
+        errors: List[BaseException] = []
+        pending = set(futures)
+
+        while pending:
+            now = time.time()
+            # Children past their deadline are abandoned (a queued one is cancelled outright)
+            for future in [f for f in pending if deadlines[f] is not None and deadlines[f] <= now]:
+                pending.discard(future)
+                if not future.cancel():
+                    self._abandon(futures[future], future)
+                name = names[futures[future]]
+                signals["components"][name] = {"status": "timeout", "latency_ms": (now - start_time) * 1000}
+                signals["timed_out"].append(name)
+            if not pending:
+                break
+
+            next_deadline = min((deadlines[f] for f in pending if deadlines[f] is not None), default=None)
+            done, _ = wait(
+                pending,
+                timeout=None if next_deadline is None else max(0.0, next_deadline - now),
+                return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                pending.discard(future)
+                i = futures[future]
+                name = names[i]
+                try:
+                    result, latency_ms = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    signals["components"][name] = {"status": "error", "error": repr(e)}
+                    continue
+                results[i] = result
+                signals["components"][name] = {**result.signals, "status": "ok", "latency_ms": latency_ms}
+
+        # Degrade gracefully, but don't mask a failure of every child
+        if errors and len(errors) == len(futures):
+            raise errors[0]
+        return results
+
+    def _timed_retrieve(self, retriever: BaseRetriever, query: str, depth: int):
+        child_start = time.time()
+        result = retriever.retrieve(query, k=depth)
+        return result, (time.time() - child_start) * 1000
+
+    def _weight(self, i: int) -> float:
+        return self.weights.get(self.retrievers[i].__class__.__name__, 1.0)
+
+    def _fuse(self, lists: List[Tuple[int, List[ScoredHit]]], mode: str) -> Tuple[Dict[str, ScoredHit], Dict[str, float]]:
+        """Returns first-seen hits and fused scores, both keyed by doc id."""
+        doc_map: Dict[str, ScoredHit] = {}
+        fused: Dict[str, float] = {}
+
+        if mode == "max":
+            for _, docs in lists:
+                for doc in docs:
+                    if doc.id not in fused or doc.score > fused[doc.id]:
+                        doc_map[doc.id] = doc
+                        fused[doc.id] = doc.score
+            return doc_map, fused
+
+        total_weight = sum(self._weight(i) for i, _ in lists) or 1.0
+        for i, docs in lists:
+            if not docs:
+                continue
+            weight = self._weight(i)
+            if mode == "rrf":
+                contributions = [1.0 / (self.rrf_k + rank) for rank in range(1, len(docs) + 1)]
+            elif mode == "zscore":
+                raw = [doc.score for doc in docs]
+                mean = sum(raw) / len(raw)
+                std = (sum((s - mean) ** 2 for s in raw) / len(raw)) ** 0.5
+                contributions = [(s - mean) / std if std > 0 else 0.0 for s in raw]
+            else:
+                raw = [doc.score for doc in docs]
+                low, high = min(raw), max(raw)
+                contributions = [(s - low) / (high - low) if high > low else 1.0 for s in raw]
+                # Convex: weights sum to one across the responding retrievers
+                weight /= total_weight
 
-    def retrieve(self, query: str, k: int = 5) -> RetrievalResult:
-        import time
+            for doc, contribution in zip(docs, contributions):
+                doc_map.setdefault(doc.id, doc)
+                fused[doc.id] = fused.get(doc.id, 0.0) + weight * contribution
+        return doc_map, fused
+
+    def _rrf_settled(self, lists: List[Tuple[int, List[ScoredHit]]], fused: Dict[str, float], depth: int, k: int) -> bool:
+        """True when no document below the fetched depth could change the fused top-k or its order."""
+        # Best contribution any not-yet-fetched rank of each list could still add
+        tails = {
+            i: 0.0 if len(docs) < depth else self._weight(i) / (self.rrf_k + depth + 1)
+            for i, docs in lists
+        }
+        members = {i: {doc.id for doc in docs} for i, docs in lists}
+        unseen_bound = sum(tails.values())
+
+        def upper(doc_id: str) -> float:
+            return fused[doc_id] + sum(tail for i, tail in tails.items() if doc_id not in members[i])
+
+        ranked = sorted(fused, key=fused.get, reverse=True)
+        if len(ranked) < k:
+            return unseen_bound == 0.0
+
+        top = ranked[:k]
+        if any(fused[a] < upper(b) for a, b in zip(top, top[1:])):
+            return False
+        outside = max((upper(doc_id) for doc_id in ranked[k:]), default=0.0)
+        return fused[top[-1]] >= max(outside, unseen_bound)
+
+    def _run_cascade(self, query: str, hits: List[ScoredHit], k: int, signals: Dict[str, Any]) -> List[ScoredHit]:
+        stages = []
+        signals["cascade"] = stages
+        signals["cascade_exit"] = None
+        candidates = hits
+        previous_top = [hit.id for hit in candidates[:k]]
+
+        for position, stage in enumerate(self.cascade):
+            stage_start = time.time()
+            ranked = stage.reranker.rerank_hits(query, candidates)
+            keep = max(k, math.ceil(len(ranked) * stage.keep_fraction))
+            candidates = ranked[:keep]
+            stages.append({
+                "stage": stage.name,
+                "candidates_in": len(ranked),
+                "kept": len(candidates),
+                "pruned": len(ranked) - len(candidates),
+                "latency_ms": (time.time() - stage_start) * 1000
+            })
+
+            # Stable top-k: later (costlier) stages are unlikely to be worth it
+            top = [hit.id for hit in candidates[:k]]
+            if self.cascade_early_exit and top == previous_top and position < len(self.cascade) - 1:
+                signals["cascade_exit"] = stage.name
+                break
+            previous_top = top
+
+        return candidates
+
+    def retrieve(self, query: str, k: int = 5, fusion: Optional[str] = None) -> RetrievalResult:
         start_time = time.time()
-        
-        # 1. Fan-out retrieval (high recall)
-        all_docs: List[Document] = []
+        mode = fusion or self.fusion
+        if mode not in self.FUSION_MODES:
+            raise ValueError(f"Unknown fusion '{mode}', expected one of {self.FUSION_MODES}")
+
+        # 1. Fan-out retrieval (high recall), all children in parallel
         signals = {
             "retrievers_used": [],
             "raw_counts": {},
-            "components": {}
+            "components": {},
+            "timed_out": [],
+            "fusion": mode
         }
-        
-        for retriever in self.retrievers:
-            result = retriever.retrieve(query, k=self.overfetch)
-            docs = result.documents
-            name = retriever.__class__.__name__
-            
+
+        early_stop = self.early_stop and mode == "rrf"
+        depth = min(k, self.overfetch) if early_stop else self.overfetch
+        results: Dict[int, RetrievalResult] = {}
+        active = list(range(len(self.retrievers)))
+        rounds = 0
+
+        fetched_depth = depth
+        while True:
+            rounds += 1
+            try:
+                results.update(self._fan_out(query, depth, active, start_time, signals))
+            except Exception as e:
+                if rounds == 1:
+                    raise
+                # Every child failed to deepen: answer from the lists already fused
+                signals["deepening_error"] = repr(e)
+                break
+            fetched_depth = depth
+            # Tag provenance on derived hits; the children's hits stay untouched
+            lists = []
+            for i in sorted(results):
+                name = self.retrievers[i].__class__.__name__
+                lists.append((i, [hit.with_score(hit.score, retriever=name, raw_score=hit.score) for hit in results[i].hits]))
+            doc_map, fused = self._fuse(lists, mode)
+            if not early_stop or depth >= self.overfetch or self._rrf_settled(lists, fused, depth, k):
+                break
+            # Deepen only the children whose lists were cut off at the current depth
+            active = [i for i, docs in lists if len(docs) >= depth]
+            if not active:
+                break
+            depth = min(self.overfetch, depth * 2)
+
+        signals["fusion_depth"] = fetched_depth
+        signals["fusion_rounds"] = rounds
+
+        for i, docs in lists:
+            name = self.retrievers[i].__class__.__name__
             signals["retrievers_used"].append(name)
             signals["raw_counts"][name] = len(docs)
-            signals["components"][name] = result.signals
-            
-            for d in docs:
-                # Ensure metadata exists
-                if d.metadata is None:
-                    d.metadata = {}
-                
-                # Tag provenance
-                d.metadata["retriever"] = name
-                d.metadata["raw_score"] = d.score
-            all_docs.extend(docs)
-
-        if not all_docs:
-            signals["retrieval_latency_ms"] = (time.time() - start_time) * 1000
-            return RetrievalResult(documents=[], signals=signals)
 
-        # 2. De-duplicate by doc.id (keep best raw score)
-        best_by_id: Dict[str, Document] = {}
-        for doc in all_docs:
-            if doc.id not in best_by_id or doc.score > best_by_id[doc.id].score:
-                best_by_id[doc.id] = doc
+        signals["degraded"] = len(signals["retrievers_used"]) < len(self.retrievers)
+        signals["fan_out_latency_ms"] = (time.time() - start_time) * 1000
+
+        if not doc_map:
+            signals["retrieval_latency_ms"] = (time.time() - start_time) * 1000
+            return RetrievalResult(hits=[], signals=signals)
 
-        unique_docs = list(best_by_id.values())
+        # 2. De-duplicate by doc.id, scoring each hit with the fused score
+        unique_docs = sorted(
+            (hit.with_score(fused[doc_id]) for doc_id, hit in doc_map.items()),
+            key=lambda d: d.score,
+            reverse=True
+        )
         signals["deduped_count"] = len(unique_docs)
 
         # 🔥 RERANK HERE (Before Normalization)
-        if self.reranker:
+        if self.cascade:
+            unique_docs = self._run_cascade(query, unique_docs, k, signals)
+        elif self.reranker:
             # Reranker takes the unique pool and re-scores/re-orders them
-            unique_docs = self.reranker.rerank(query, unique_docs)
+            unique_docs = self.reranker.rerank_hits(query, unique_docs)
 
-        # 3. Normalize scores (Min-Max) 
+        # 3. Normalize scores (Min-Max)
         # Reranked scores might need normalization too to fit [0,1] expectation for downstream logic
         scores = [d.score for d in unique_docs]
         if not scores:
              signals["retrieval_latency_ms"] = (time.time() - start_time) * 1000
-             return RetrievalResult(documents=[], signals=signals)
-             
+             return RetrievalResult(hits=[], signals=signals)
+
         min_s, max_s = min(scores), max(scores)
-        
+
         signals["avg_score"] = sum(scores) / len(scores)
 
-        for d in unique_docs:
-            if max_s > min_s:
-                d.score = (d.score - min_s) / (max_s - min_s)
-            else:
-                d.score = 1.0
+        unique_docs = [
+            d.with_score((d.score - min_s) / (max_s - min_s) if max_s > min_s else 1.0)
+            for d in unique_docs
+        ]
 
         # 4. Sort by normalized score (or reranker score if normalization skipped)
         unique_docs.sort(key=lambda d: d.score, reverse=True)
 
         # 5. Return top-k
         final_docs = unique_docs[:k]
-        
+
         signals["retrieval_latency_ms"] = (time.time() - start_time) * 1000
-        
+
+        # Documents are materialized lazily, for the final top-k only
         return RetrievalResult(
-            documents=final_docs,
+            hits=final_docs,
             signals=signals
         )
@@ -1,39 +1,25 @@
-from typing import List, Any
+from typing import List, Any, Union
 from brainbox.core.knowledge.retrievers.base import BaseRetriever
 from brainbox.core.knowledge.retrieval_result import RetrievalResult
+from brainbox.core.knowledge.scored_hit import ScoredHit
 from brainbox.core.knowledge.indexing.inverted_index import InvertedIndex
+from brainbox.core.knowledge.indexing.segmented_index import SegmentedIndex
 
 class InvertedIndexRetriever(BaseRetriever):
     """
-    Retriever backed by an InvertedIndex.
+    Retriever backed by an InvertedIndex (or its on-disk SegmentedIndex
+    counterpart), ranked with BM25 (or BM25+).
     """
-    def __init__(self, index: InvertedIndex):
+    def __init__(self, index: Union[InvertedIndex, SegmentedIndex], scorer: str = "bm25"):
         self.index = index
+        self.scorer = scorer
 
     def retrieve(self, query: str, k: int = 5) -> RetrievalResult:
-        all_matches = self.index.retrieve(query)
-        
-        # Simple scoring: Term Frequency in query matched in doc? 
-        # Actually base InvertedIndex implementation returns OR matches.
-        # Let's refine scoring here or in the Index.
-        # For now, just trust the index results and maybe truncate to k.
-        # A better implementation would have TF-IDF logic.
-        
-        # Let's do a simple count of query terms present in doc for scoring
-        query_tokens = self.index._tokenize(query)
-        scored_docs = []
-        for doc in all_matches:
-            doc_tokens = self.index._tokenize(doc.content)
-            doc_tokens_set = set(doc_tokens)
-            score = sum(1 for q_term in query_tokens if q_term in doc_tokens_set)
-            
-            doc.score = score
-            scored_docs.append(doc)
-            
-        scored_docs.sort(key=lambda x: x.score, reverse=True)
-        top_k = scored_docs[:k]
-        
+        # Scoring happens inside the index over the query terms' postings only;
+        # the indexed documents are wrapped, never re-scored in place
+        hits = [ScoredHit(doc, score) for doc, score in self.index.search(query, k=k, scorer=self.scorer)]
+
         return RetrievalResult(
-            documents=top_k,
-            signals={"retriever": "InvertedIndexRetriever", "count": len(top_k)}
+            hits=hits,
+            signals={"retriever": "InvertedIndexRetriever", "count": len(hits), "scorer": self.scorer}
         )
@@ -1,31 +1,43 @@
-from typing import List
+import heapq
+from typing import Dict, List, Optional
 from .base import BaseRetriever
 from ..documents import Document
 from ..retrieval_result import RetrievalResult
+from ..scored_hit import ScoredHit
+from ..analysis import Analyzer, default_analyzer
 
 class KeywordRetriever(BaseRetriever):
-    def __init__(self, documents: List[Document]):
+    """
+    Ranks documents by the number of distinct query terms they contain.
+
+    Term postings are built once at construction, so a query only touches the
+    documents sharing at least one of its terms. Results are immutable
+    ScoredHits over the indexed documents, which are never mutated.
+    """
+    def __init__(self, documents: List[Document], analyzer: Optional[Analyzer] = None):
         self.documents = documents
+        self.analyzer = analyzer or default_analyzer()
 
-    def retrieve(self, query: str, k: int = 3) -> RetrievalResult:
-        query_terms = set(query.lower().split())  # Lowercase and split the query into terms
+        # term -> positions in self.documents (each document listed once per term)
+        self.postings: Dict[str, List[int]] = {}
+        for position, doc in enumerate(documents):
+            for term in set(self.analyzer.analyze_document(doc)):
+                self.postings.setdefault(term, []).append(position)
 
-        # Calculate the score for each document based on keyword overlap
-        scored_docs = []
-        for doc in self.documents:
-            doc_terms = set(doc.content.lower().split())  # Lowercase and split document into terms
-            overlap = len(query_terms & doc_terms)  # Count the overlapping words
-            if overlap > 0:
-                doc.score = overlap
-                scored_docs.append((doc, overlap))
+    def retrieve(self, query: str, k: int = 3) -> RetrievalResult:
+        query_terms = set(self.analyzer.analyze_query(query))  # Normalized, stopword-free, stemmed query terms
 
-        # Sort documents by score (overlap) in descending order
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
+        # Count, per document, how many distinct query terms it contains
+        overlaps: Dict[int, int] = {}
+        for term in query_terms:
+            for position in self.postings.get(term, ()):
+                overlaps[position] = overlaps.get(position, 0) + 1
 
-        # Return top-k documents with the highest scores
-        top_k_docs = [doc for doc, score in scored_docs[:k]]
+        # Highest overlap first; ties keep corpus order
+        top = heapq.nlargest(k, overlaps.items(), key=lambda item: (item[1], -item[0]))
+        hits = [ScoredHit(self.documents[position], overlap) for position, overlap in top]
 
         return RetrievalResult(
-            documents=top_k_docs,
-            signals={"retriever": "KeywordRetriever", "count": len(top_k_docs)}
-        )
\ No newline at end of file
+            hits=hits,
+            signals={"retriever": "KeywordRetriever", "count": len(hits)}
+        )
@@ -1,6 +1,7 @@
 from typing import List
 from brainbox.core.knowledge.documents import Document
 from brainbox.core.knowledge.retrieval_result import RetrievalResult
+from brainbox.core.knowledge.scored_hit import ScoredHit
 from brainbox.core.knowledge.retrievers import BaseRetriever
 from brainbox.core.embeddings.base import EmbeddingClient
 from brainbox.core.vectorstore.base import VectorStore
@@ -21,8 +22,36 @@ class VectorRetriever(BaseRetriever):
         # 2. Search the vector store
         results = self.vector_store.search(query_vector, k=k)
 
-        # 3. Convert results to Documents
-        documents = []
+        # 3. Convert results to scored hits
+        hits = self._to_hits(results)
+            
+        return RetrievalResult(
+            hits=hits,
+            signals={"retriever": "VectorRetriever", "count": len(hits), "index_type": self.vector_store.index_type}
+        )
+
+    def retrieve_batch(self, queries: List[str], k: int = 3) -> List[RetrievalResult]:
+        """
+        Retrieve for many queries at once: one embedding call and one
+        batched vector search (a single matrix multiply for flat stores).
+        """
+        if not queries:
+            return []
+
+        query_vectors = self.embedding_client.embed(queries)
+        batch_results = self.vector_store.search_batch(query_vectors, k=k)
+
+        retrieval_results = []
+        for results in batch_results:
+            hits = self._to_hits(results)
+            retrieval_results.append(RetrievalResult(
+                hits=hits,
+                signals={"retriever": "VectorRetriever", "count": len(hits), "index_type": self.vector_store.index_type}
+            ))
+        return retrieval_results
+
+    def _to_hits(self, results: List[dict]) -> List[ScoredHit]:
+        hits = []
         for result in results:
             meta = result.get("metadata", {})
             score = result.get("score")
@@ -31,16 +60,12 @@ class VectorRetriever(BaseRetriever):
             doc_id = meta.get("id", "unknown")
             content = meta.get("content", "")
             
-            # Create Document
+            # Wrap the stored metadata without copying; hits never write to it
             doc = Document(
                 id=doc_id,
                 content=content,
                 metadata=meta,
                 score=score
             )
-            documents.append(doc)
-            
-        return RetrievalResult(
-            documents=documents,
-            signals={"retriever": "VectorRetriever", "count": len(documents), "index_type": "flat"}
-        )
+            hits.append(ScoredHit(doc, score))
+        return hits
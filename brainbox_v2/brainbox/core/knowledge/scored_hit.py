@@ -0,0 +1,64 @@
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+from brainbox.core.knowledge.documents import Document
+
+_NO_ANNOTATIONS: Mapping[str, Any] = MappingProxyType({})
+
+class ScoredHit:
+    """
+    Immutable (document, score) record returned by retrievers and rerankers.
+
+    A hit references the shared source Document without copying or mutating
+    it; per-query data (score, provenance annotations such as "retriever" or
+    "raw_score") lives on the hit. Re-scoring creates a new hit, so concurrent
+    queries over the same corpus never race. A full Document copy is only
+    built by to_document(), typically for the final top-k.
+    """
+    __slots__ = ("source", "score", "annotations")
+
+    def __init__(self, source: Document, score: float, annotations: Optional[Mapping[str, Any]] = None):
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "score", score)
+        object.__setattr__(self, "annotations", MappingProxyType(dict(annotations)) if annotations else _NO_ANNOTATIONS)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("ScoredHit is immutable; use with_score() to derive a new hit")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("ScoredHit is immutable")
+
+    def __repr__(self) -> str:
+        return f"ScoredHit(id={self.id!r}, score={self.score!r})"
+
+    @classmethod
+    def from_document(cls, document: Document) -> "ScoredHit":
+        return cls(document, document.score)
+
+    @property
+    def id(self) -> str:
+        return self.source.id
+
+    @property
+    def content(self) -> str:
+        return self.source.content
+
+    @property
+    def metadata(self) -> Mapping[str, Any]:
+        """Read-only view of the source metadata overlaid with this hit's annotations."""
+        base = self.source.metadata or {}
+        if not self.annotations:
+            return MappingProxyType(base)
+        return MappingProxyType({**base, **self.annotations})
+
+    def with_score(self, score: float, **annotations: Any) -> "ScoredHit":
+        merged = {**self.annotations, **annotations} if annotations else self.annotations
+        return ScoredHit(self.source, score, merged)
+
+    def to_document(self) -> Document:
+        """Materialize a private Document copy the caller may freely modify."""
+        return Document(
+            id=self.source.id,
+            content=self.source.content,
+            metadata={**(self.source.metadata or {}), **self.annotations},
+            score=self.score
+        )
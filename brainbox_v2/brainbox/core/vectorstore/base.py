@@ -4,6 +4,11 @@ from brainbox.core.knowledge.documents import Document
 from brainbox.core.knowledge.retrieval_result import RetrievalResult
 
 class VectorStore(ABC):
+    # Reported by retrievers in their signals; ANN stores override this
+    index_type: str = "flat"
+    # Whether the contents survive a restart (manifest-driven sync relies on it)
+    persistent: bool = False
+
     @abstractmethod
     def add(self, vectors: List[List[float]], metadatas: List[dict]) -> None:
         pass
@@ -12,6 +17,20 @@ class VectorStore(ABC):
     def search(self, query_vector: List[float], k: int) -> List[dict]:
         pass
 
+    def search_batch(self, query_vectors: List[List[float]], k: int) -> List[List[dict]]:
+        """
+        Search for several query vectors at once.
+        Stores that can score a whole batch in one pass should override this.
+        """
+        return [self.search(query_vector, k) for query_vector in query_vectors]
+
+    def delete(self, ids: List[str]) -> None:
+        """
+        Remove every vector whose metadata "chunk_id" (or "id") is in ids.
+        Deletes may rewrite the store, so pass all ids of an update in one call.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support deletes")
+
 class BaseVectorStore(ABC):
     @abstractmethod
     def add(self, documents: List[Document]):
@@ -2,6 +2,7 @@ from typing import List, Optional, Any
 from brainbox.core.vectorstore.base import BaseVectorStore
 from brainbox.core.knowledge.documents import Document
 from brainbox.core.knowledge.retrieval_result import RetrievalResult
+from brainbox.core.knowledge.scored_hit import ScoredHit
 
 try:
     import chromadb
@@ -57,7 +58,7 @@ class ChromaVectorStore(BaseVectorStore):
             metadatas = results["metadatas"][0]
             documents_text = results["documents"][0]
 
-            retrieved_docs = []
+            hits = []
             for i, doc_id in enumerate(ids):
                 score = 1.0 / (1.0 + distances[i]) 
                 doc = Document(
@@ -66,24 +67,24 @@ class ChromaVectorStore(BaseVectorStore):
                     metadata=metadatas[i],
                     score=score
                 )
-                retrieved_docs.append(doc)
+                hits.append(ScoredHit(doc, score))
         else:
             # Simple mock retrieval: text contains query word?
             # Or just return all because it's a small demo
-            retrieved_docs = []
+            # Stored documents are wrapped in hits, never re-scored in place
+            hits = []
             for doc in self.mock_store.values():
                 # Mock similarity
                 if query.lower() in doc.content.lower():
-                     doc.score = 0.9
-                     retrieved_docs.append(doc)
+                     hits.append(ScoredHit(doc, 0.9))
             
             # Sort and slice
-            retrieved_docs.sort(key=lambda x: x.score, reverse=True)
-            retrieved_docs = retrieved_docs[:k]
+            hits.sort(key=lambda x: x.score, reverse=True)
+            hits = hits[:k]
 
         return RetrievalResult(
-            documents=retrieved_docs,
-            signals={"retriever": "ChromaVectorStore", "count": len(retrieved_docs), "mocked": self.use_mock}
+            hits=hits,
+            signals={"retriever": "ChromaVectorStore", "count": len(hits), "mocked": self.use_mock}
         )
 
     def delete(self, ids: List[str]):
@@ -1,51 +1,158 @@
-import math
-from typing import List, Dict, Any
+from typing import Dict, Iterator, List, Optional
+import numpy as np
 from .base import VectorStore
 
 class InMemoryVectorStore(VectorStore):
-    def __init__(self):
-        # List of {"vector": [...], "metadata": {...}}
-        self.store: List[Dict[str, Any]] = []
-
-    def _dot_product(self, v1: List[float], v2: List[float]) -> float:
-        return sum(a * b for a, b in zip(v1, v2))
-
-    def _magnitude(self, v: List[float]) -> float:
-        return math.sqrt(sum(x * x for x in v))
-
-    def _cosine_similarity(self, v1: List[float], v2: List[float]) -> float:
-        dot = self._dot_product(v1, v2)
-        mag1 = self._magnitude(v1)
-        mag2 = self._magnitude(v2)
-        
-        if mag1 == 0 or mag2 == 0:
-            return 0.0
-            
-        return dot / (mag1 * mag2)
+    """
+    Flat (brute-force) vector store backed by a contiguous float32 matrix.
+    Rows are L2-normalized on insert, so cosine similarity is a single
+    matrix-vector (or matrix-matrix for batches) product.
+
+    Deletes look rows up in a chunk id -> rows map (built on the first
+    delete, then kept current), so finding the rows to drop costs
+    O(len(ids)) rather than a scan over every row's metadata.
+    """
+    def __init__(self, initial_capacity: int = 1024):
+        self.initial_capacity = max(1, initial_capacity)
+        # Row-major (capacity, dim) buffer; only the first self.size rows are valid
+        self.matrix: np.ndarray = None
+        self.metadatas: List[dict] = []
+        self.size = 0
+        self.dim = None
+        self._row_ids: Optional[Dict[str, List[int]]] = None
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        # Zero vectors stay zero (similarity 0.0) instead of producing NaNs
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _ensure_capacity(self, extra: int):
+        needed = self.size + extra
+        if self.matrix is not None and needed <= self.matrix.shape[0]:
+            return
+
+        capacity = self.matrix.shape[0] if self.matrix is not None else self.initial_capacity
+        while capacity < needed:
+            capacity *= 2
+
+        # Grow geometrically so appends stay amortized O(1) per row
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        if self.matrix is not None:
+            matrix[:self.size] = self.matrix[:self.size]
+        self.matrix = matrix
 
     def add(self, vectors: List[List[float]], metadatas: List[dict]) -> None:
         if len(vectors) != len(metadatas):
             raise ValueError("Number of vectors must match number of metadatas")
-            
-        for vec, meta in zip(vectors, metadatas):
-            self.store.append({
-                "vector": vec,
-                "metadata": meta
-            })
+        if not vectors:
+            return
+
+        batch = np.asarray(vectors, dtype=np.float32)
+        if batch.ndim != 2:
+            raise ValueError("Vectors must all have the same dimension")
+        if self.dim is None:
+            self.dim = batch.shape[1]
+        elif batch.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {batch.shape[1]}")
+
+        self._ensure_capacity(len(batch))
+        self.matrix[self.size:self.size + len(batch)] = self._normalize(batch)
+        self.metadatas.extend(metadatas)
+        self._index_rows(self.size, metadatas)
+        self.size += len(batch)
+
+    def _metadata(self, row: int) -> dict:
+        return self.metadatas[row]
+
+    def _iter_metadata(self) -> Iterator[dict]:
+        for row in range(self.size):
+            yield self._metadata(row)
+
+    @staticmethod
+    def _chunk_key(meta) -> Optional[str]:
+        return meta.get("chunk_id", meta.get("id"))
+
+    def _id_index(self) -> Dict[str, List[int]]:
+        if self._row_ids is None:
+            row_ids: Dict[str, List[int]] = {}
+            for row, meta in enumerate(self._iter_metadata()):
+                row_ids.setdefault(self._chunk_key(meta), []).append(row)
+            self._row_ids = row_ids
+        return self._row_ids
+
+    def _index_rows(self, start: int, metadatas: List[dict]):
+        # Only maintained once built; until the first delete nothing is tracked
+        if self._row_ids is not None:
+            for row, meta in enumerate(metadatas, start):
+                self._row_ids.setdefault(self._chunk_key(meta), []).append(row)
+
+    def _keep_mask(self, ids: List[str]) -> np.ndarray:
+        row_ids = self._id_index()
+        keep = np.ones(self.size, dtype=bool)
+        for chunk_id in set(ids):
+            for row in row_ids.get(chunk_id, ()):
+                keep[row] = False
+        return keep
+
+    def _reindex_after_compaction(self, keep: np.ndarray):
+        if self._row_ids is None:
+            return
+        new_rows = np.cumsum(keep) - 1
+        row_ids = {}
+        for chunk_id, rows in self._row_ids.items():
+            kept = [int(new_rows[row]) for row in rows if keep[row]]
+            if kept:
+                row_ids[chunk_id] = kept
+        self._row_ids = row_ids
+
+    def _compact(self, keep: np.ndarray) -> None:
+        kept = np.flatnonzero(keep)
+        self.matrix[:len(kept)] = self.matrix[kept]
+        self.metadatas = [self.metadatas[row] for row in kept]
+        self.size = len(kept)
+        self._reindex_after_compaction(keep)
+
+    def delete(self, ids: List[str]) -> None:
+        if self.size == 0 or not ids:
+            return
+        keep = self._keep_mask(ids)
+        if not keep.all():
+            self._compact(keep)
 
     def search(self, query_vector: List[float], k: int) -> List[dict]:
-        if not self.store:
+        return self.search_batch([query_vector], k)[0]
+
+    def search_batch(self, query_vectors: List[List[float]], k: int) -> List[List[dict]]:
+        if not query_vectors:
             return []
+        if self.size == 0 or k <= 0:
+            return [[] for _ in query_vectors]
+
+        queries = self._normalize(np.asarray(query_vectors, dtype=np.float32))
+        # (n_queries, size) cosine similarities in one GEMM
+        scores = queries @ self.matrix[:self.size].T
 
-        scored_results = []
-        for item in self.store:
-            score = self._cosine_similarity(query_vector, item["vector"])
-            scored_results.append({
-                "score": score,
-                "metadata": item["metadata"]
-            })
+        k = min(k, self.size)
+        if k < self.size:
+            # Partial selection of the top-k columns, then sort only those
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(self.size), (len(queries), self.size))
 
-        # Sort by score descending
-        scored_results.sort(key=lambda x: x["score"], reverse=True)
+        results = []
+        for row, candidates in enumerate(top):
+            row_scores = scores[row, candidates]
+            order = np.argsort(-row_scores, kind="stable")
+            results.append([
+                {
+                    "score": float(row_scores[i]),
+                    "metadata": self._metadata(candidates[i])
+                }
+                for i in order
+            ])
+        return results
 
-        return scored_results[:k]
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,146 @@
+from typing import List, Optional
+import numpy as np
+from .in_memory import InMemoryVectorStore
+
+class IVFVectorStore(InMemoryVectorStore):
+    """
+    Approximate nearest-neighbour store using an inverted file (IVF) index.
+
+    Vectors are clustered with spherical k-means into `n_lists` cells. A query
+    only scores the vectors in its `nprobe` closest cells, so latency grows with
+    nprobe * (N / n_lists) instead of N. Raise `nprobe` for recall, lower it for
+    speed; nprobe == n_lists is an exact search.
+
+    Until `train_size` vectors have been added the store behaves as a flat index.
+    """
+    def __init__(
+        self,
+        n_lists: int = 256,
+        nprobe: int = 8,
+        train_size: Optional[int] = None,
+        max_iter: int = 20,
+        seed: int = 0,
+        initial_capacity: int = 1024
+    ):
+        super().__init__(initial_capacity=initial_capacity)
+        if n_lists < 1:
+            raise ValueError("n_lists must be >= 1")
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        # Enough points per cell for k-means to produce meaningful centroids
+        self.train_size = train_size if train_size is not None else n_lists * 39
+        self.max_iter = max_iter
+        self.seed = seed
+
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+
+    @property
+    def index_type(self) -> str:
+        return "ivf" if self.is_trained else "flat"
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def add(self, vectors: List[List[float]], metadatas: List[dict]) -> None:
+        start = self.size
+        super().add(vectors, metadatas)
+
+        if self.is_trained:
+            self._assign_rows(start, self.size)
+        elif self.size >= self.train_size:
+            self.train()
+
+    def train(self) -> None:
+        """
+        (Re)build the coarse quantizer from every vector currently stored.
+        """
+        if self.size == 0:
+            return
+
+        data = self.matrix[:self.size]
+        n_lists = min(self.n_lists, self.size)
+        rng = np.random.default_rng(self.seed)
+        centroids = data[rng.choice(self.size, n_lists, replace=False)].copy()
+
+        for _ in range(self.max_iter):
+            labels = self._nearest_centroid(data, centroids)
+
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            counts = np.bincount(labels, minlength=n_lists)
+
+            # Re-seed empty cells from random points so no list goes unused
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                sums[empty] = data[rng.choice(self.size, len(empty), replace=False)]
+
+            new_centroids = self._normalize(sums)
+            if np.allclose(new_centroids, centroids, atol=1e-4):
+                centroids = new_centroids
+                break
+            centroids = new_centroids
+
+        self.centroids = centroids.astype(np.float32)
+        self.lists = [np.empty(0, dtype=np.int64) for _ in range(n_lists)]
+        self._assign_rows(0, self.size)
+
+    def _nearest_centroid(self, data: np.ndarray, centroids: np.ndarray, block: int = 65536) -> np.ndarray:
+        # Assign in blocks to bound the (block, n_lists) score matrix
+        labels = np.empty(len(data), dtype=np.int64)
+        for start in range(0, len(data), block):
+            labels[start:start + block] = np.argmax(data[start:start + block] @ centroids.T, axis=1)
+        return labels
+
+    def _assign_rows(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        labels = self._nearest_centroid(self.matrix[start:end], self.centroids)
+        row_ids = np.arange(start, end, dtype=np.int64)
+        for list_id in np.unique(labels):
+            self.lists[list_id] = np.concatenate([self.lists[list_id], row_ids[labels == list_id]])
+
+    def _compact(self, keep: np.ndarray) -> None:
+        super()._compact(keep)
+        if self.is_trained:
+            # Surviving rows shift down; translate every list to the new row ids
+            new_rows = np.cumsum(keep) - 1
+            self.lists = [new_rows[rows[keep[rows]]] for rows in self.lists]
+
+    def search_batch(self, query_vectors: List[List[float]], k: int) -> List[List[dict]]:
+        if not self.is_trained:
+            return super().search_batch(query_vectors, k)
+        if not query_vectors:
+            return []
+        if k <= 0:
+            return [[] for _ in query_vectors]
+
+        queries = self._normalize(np.asarray(query_vectors, dtype=np.float32))
+        nprobe = max(1, min(self.nprobe, len(self.centroids)))
+        centroid_scores = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+
+        results = []
+        for query, probe in zip(queries, probes):
+            candidates = np.concatenate([self.lists[list_id] for list_id in probe])
+            if len(candidates) == 0:
+                results.append([])
+                continue
+
+            scores = self.matrix[candidates] @ query
+            top_n = min(k, len(candidates))
+            if top_n < len(candidates):
+                top = np.argpartition(-scores, top_n - 1)[:top_n]
+            else:
+                top = np.arange(len(candidates))
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            results.append([
+                {
+                    "score": float(scores[i]),
+                    "metadata": self._metadata(candidates[i])
+                }
+                for i in top
+            ])
+        return results
@@ -0,0 +1,216 @@
+import json
+import os
+import shutil
+from typing import Iterator, List, Optional
+import numpy as np
+from .in_memory import InMemoryVectorStore
+
+class MmapVectorStore(InMemoryVectorStore):
+    """
+    Disk-backed flat vector store.
+
+    Layout of the store directory:
+    - vectors.f32   : raw row-major float32 matrix of L2-normalized vectors
+    - metadata.jsonl: one JSON metadata object per row, append-only
+    - metadata.idx  : uint64 byte offset of each row in metadata.jsonl
+    - header.json   : dimension and committed row count
+
+    The matrix and offsets are memory-mapped read-only, so opening a prebuilt
+    store is near-instant and worker processes share the same page cache.
+    Metadata is decoded lazily, only for the rows a search returns.
+    `add` appends to the files and bumps the committed count last, so a
+    crash mid-append never exposes a partial row. `delete` copies the
+    surviving rows (metadata lines verbatim, without decoding them) into a
+    fresh directory and swaps it in; the chunk id -> rows map it needs is
+    read once per open in a single pass over metadata.jsonl.
+    """
+    VECTORS_FILE = "vectors.f32"
+    METADATA_FILE = "metadata.jsonl"
+    OFFSETS_FILE = "metadata.idx"
+    HEADER_FILE = "header.json"
+    persistent = True
+    # Rows copied per block when compacting
+    COPY_BLOCK_ROWS = 65536
+
+    def __init__(self, path: str, dim: Optional[int] = None):
+        super().__init__()
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self.offsets: Optional[np.ndarray] = None
+
+        header_path = self._file(self.HEADER_FILE)
+        if os.path.exists(header_path):
+            with open(header_path, "r", encoding="utf-8") as f:
+                header = json.load(f)
+            if dim is not None and dim != header["dim"]:
+                raise ValueError(f"Store at {path} has dimension {header['dim']}, not {dim}")
+            self.dim = header["dim"]
+            self.size = header["count"]
+        else:
+            self.dim = dim
+
+        self._remap()
+
+    @classmethod
+    def open(cls, path: str) -> "MmapVectorStore":
+        """
+        Open an existing store without loading it into memory.
+        """
+        if not os.path.exists(os.path.join(path, cls.HEADER_FILE)):
+            raise FileNotFoundError(f"No vector store found at: {path}")
+        return cls(path)
+
+    @classmethod
+    def snapshot(cls, store: InMemoryVectorStore, path: str) -> "MmapVectorStore":
+        """
+        Write the contents of an in-memory store to `path` and open it.
+        """
+        if os.path.exists(os.path.join(path, cls.HEADER_FILE)):
+            raise FileExistsError(f"Vector store already exists at: {path}")
+
+        persistent = cls(path, dim=store.dim)
+        if store.size:
+            # Rows are already normalized; re-normalizing is a no-op
+            persistent.add(store.matrix[:store.size], [store._metadata(i) for i in range(store.size)])
+        return persistent
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _remap(self):
+        # Map only the committed rows; bytes past them belong to an unfinished append
+        if self.size == 0:
+            self.matrix = None
+            self.offsets = None
+            return
+        self.matrix = np.memmap(self._file(self.VECTORS_FILE), dtype=np.float32, mode="r", shape=(self.size, self.dim))
+        self.offsets = np.memmap(self._file(self.OFFSETS_FILE), dtype=np.uint64, mode="r", shape=(self.size,))
+
+    def _write_header(self):
+        tmp_path = self._file(self.HEADER_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "count": self.size}, f)
+        os.replace(tmp_path, self._file(self.HEADER_FILE))
+
+    def _truncate_uncommitted(self):
+        # Drop any tail left behind by an append that never committed
+        vectors_path = self._file(self.VECTORS_FILE)
+        offsets_path = self._file(self.OFFSETS_FILE)
+        metadata_path = self._file(self.METADATA_FILE)
+        if not os.path.exists(vectors_path):
+            return
+
+        metadata_end = 0
+        if self.size:
+            with open(metadata_path, "rb") as f:
+                f.seek(int(self.offsets[-1]))
+                f.readline()
+                metadata_end = f.tell()
+
+        for file_path, length in (
+            (vectors_path, self.size * self.dim * 4),
+            (offsets_path, self.size * 8),
+            (metadata_path, metadata_end),
+        ):
+            if os.path.getsize(file_path) > length:
+                with open(file_path, "r+b") as f:
+                    f.truncate(length)
+
+    def add(self, vectors: List[List[float]], metadatas: List[dict]) -> None:
+        if len(vectors) != len(metadatas):
+            raise ValueError("Number of vectors must match number of metadatas")
+        if len(vectors) == 0:
+            return
+
+        batch = np.asarray(vectors, dtype=np.float32)
+        if batch.ndim != 2:
+            raise ValueError("Vectors must all have the same dimension")
+        if self.dim is None:
+            self.dim = batch.shape[1]
+        elif batch.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {batch.shape[1]}")
+
+        self._truncate_uncommitted()
+
+        with open(self._file(self.METADATA_FILE), "ab") as f:
+            position = f.tell()
+            offsets = np.empty(len(metadatas), dtype=np.uint64)
+            for i, meta in enumerate(metadatas):
+                # Mapping views (e.g. ChunkRecord) are written as plain objects
+                line = json.dumps(meta if isinstance(meta, dict) else dict(meta), ensure_ascii=False).encode("utf-8") + b"\n"
+                offsets[i] = position
+                f.write(line)
+                position += len(line)
+
+        with open(self._file(self.OFFSETS_FILE), "ab") as f:
+            f.write(offsets.tobytes())
+
+        with open(self._file(self.VECTORS_FILE), "ab") as f:
+            f.write(np.ascontiguousarray(self._normalize(batch), dtype=np.float32).tobytes())
+
+        self._index_rows(self.size, metadatas)
+        self.size += len(batch)
+        self._write_header()
+        self._remap()
+
+    def _metadata(self, row: int) -> dict:
+        # A fresh handle per lookup keeps concurrent searches from sharing a file position
+        with open(self._file(self.METADATA_FILE), "rb") as f:
+            f.seek(int(self.offsets[row]))
+            return json.loads(f.readline())
+
+    def _iter_metadata(self) -> Iterator[dict]:
+        # One sequential read instead of a seek and open per row
+        if self.size == 0:
+            return
+        with open(self._file(self.METADATA_FILE), "rb") as f:
+            for _ in range(self.size):
+                yield json.loads(f.readline())
+
+    def _write_kept(self, staging_path: str, keep: np.ndarray) -> None:
+        os.makedirs(staging_path)
+        kept = np.flatnonzero(keep)
+        offsets = np.empty(len(kept), dtype=np.uint64)
+
+        # Metadata lines are copied as raw bytes; rows are in file order
+        with open(self._file(self.METADATA_FILE), "rb") as source, \
+                open(os.path.join(staging_path, self.METADATA_FILE), "wb") as target:
+            position = 0
+            out = 0
+            for row in range(self.size):
+                line = source.readline()
+                if keep[row]:
+                    offsets[out] = position
+                    target.write(line)
+                    position += len(line)
+                    out += 1
+
+        with open(os.path.join(staging_path, self.OFFSETS_FILE), "wb") as f:
+            f.write(offsets.tobytes())
+
+        with open(os.path.join(staging_path, self.VECTORS_FILE), "wb") as f:
+            for start in range(0, len(kept), self.COPY_BLOCK_ROWS):
+                rows = kept[start:start + self.COPY_BLOCK_ROWS]
+                f.write(np.ascontiguousarray(self.matrix[rows]).tobytes())
+
+        with open(os.path.join(staging_path, self.HEADER_FILE), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "count": len(kept)}, f)
+
+    def _compact(self, keep: np.ndarray) -> None:
+        staging_path = self.path.rstrip(os.sep) + ".compacting"
+        shutil.rmtree(staging_path, ignore_errors=True)
+        self._write_kept(staging_path, keep)
+
+        # Release our maps before swapping directories underneath them
+        self.matrix = None
+        self.offsets = None
+        retired_path = self.path.rstrip(os.sep) + ".retired"
+        shutil.rmtree(retired_path, ignore_errors=True)
+        os.replace(self.path, retired_path)
+        os.replace(staging_path, self.path)
+        shutil.rmtree(retired_path, ignore_errors=True)
+
+        self.size = int(keep.sum())
+        self._remap()
+        self._reindex_after_compaction(keep)
@@ -0,0 +1,214 @@
+from typing import List, Optional
+import numpy as np
+from .base import VectorStore
+from .in_memory import InMemoryVectorStore
+
+# Number of set bits for every byte value, used for Hamming distance on packed codes
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+class QuantizedVectorStore(VectorStore):
+    """
+    Two-stage vector store that scans compressed codes, then re-scores a
+    shortlist of `k * rescore_factor` candidates against full-precision vectors.
+
+    quantization:
+    - "int8"  : symmetric per-vector scalar quantization (dim + 4 bytes per vector)
+    - "binary": sign bits packed 8 per byte, ranked by Hamming distance (dim / 8 bytes)
+
+    Full-precision vectors and metadata live in `full_precision`. Pass an
+    `MmapVectorStore` to keep them on disk so only the codes occupy RAM.
+    """
+    QUANTIZATIONS = ("int8", "binary")
+
+    def __init__(
+        self,
+        quantization: str = "int8",
+        rescore_factor: int = 4,
+        full_precision: Optional[InMemoryVectorStore] = None,
+        block_size: int = 65536,
+        initial_capacity: int = 1024
+    ):
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization '{quantization}', expected one of {self.QUANTIZATIONS}")
+        self.quantization = quantization
+        self.rescore_factor = max(1, rescore_factor)
+        self.full_precision = full_precision if full_precision is not None else InMemoryVectorStore()
+        # Bounds the temporary float32 buffer used while scanning codes
+        self.block_size = block_size
+        self.initial_capacity = max(1, initial_capacity)
+
+        # (capacity, code_bytes) buffers; only the first self.size rows are valid
+        self.codes: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        self.size = 0
+        self.last_recall: Optional[float] = None
+
+        if self.full_precision.size:
+            self._encode_rows(0, self.full_precision.size)
+
+    @property
+    def index_type(self) -> str:
+        return f"flat-{self.quantization}"
+
+    @property
+    def persistent(self) -> bool:
+        # Codes are rebuilt from full_precision on open
+        return self.full_precision.persistent
+
+    def _encode(self, rows: np.ndarray):
+        if self.quantization == "int8":
+            scales = np.abs(rows).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.rint(rows / scales[:, None]).astype(np.int8)
+            return codes, scales.astype(np.float32)
+        return np.packbits(rows > 0, axis=1), None
+
+    def _ensure_capacity(self, needed: int, codes: np.ndarray, scales: Optional[np.ndarray]):
+        if self.codes is not None and needed <= self.codes.shape[0]:
+            return
+
+        capacity = self.codes.shape[0] if self.codes is not None else self.initial_capacity
+        while capacity < needed:
+            capacity *= 2
+
+        # Grow geometrically so batched adds stay amortized O(1) per row
+        grown = np.empty((capacity, codes.shape[1]), dtype=codes.dtype)
+        if self.codes is not None:
+            grown[:self.size] = self.codes[:self.size]
+        self.codes = grown
+        if scales is not None:
+            grown_scales = np.empty(capacity, dtype=np.float32)
+            if self.scales is not None:
+                grown_scales[:self.size] = self.scales[:self.size]
+            self.scales = grown_scales
+
+    def _encode_rows(self, start: int, end: int):
+        codes, scales = self._encode(np.asarray(self.full_precision.matrix[start:end]))
+        self._ensure_capacity(end, codes, scales)
+        self.codes[start:end] = codes
+        if scales is not None:
+            self.scales[start:end] = scales
+        self.size = end
+
+    def add(self, vectors: List[List[float]], metadatas: List[dict]) -> None:
+        start = self.full_precision.size
+        self.full_precision.add(vectors, metadatas)
+        if self.full_precision.size > start:
+            self._encode_rows(start, self.full_precision.size)
+
+    def delete(self, ids: List[str]) -> None:
+        if self.size == 0 or not ids:
+            return
+        keep = self.full_precision._keep_mask(ids)
+        if keep.all():
+            return
+        self.full_precision._compact(keep)
+        kept = np.flatnonzero(keep)
+        self.codes[:len(kept)] = self.codes[kept]
+        if self.scales is not None:
+            self.scales[:len(kept)] = self.scales[kept]
+        self.size = self.full_precision.size
+
+    def _coarse_scores(self, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(self.size, dtype=np.float32)
+        codes = self.codes[:self.size]
+        if self.quantization == "int8":
+            scales = self.scales[:self.size]
+            for start in range(0, self.size, self.block_size):
+                block = codes[start:start + self.block_size].astype(np.float32)
+                scores[start:start + self.block_size] = (block @ query) * scales[start:start + self.block_size]
+        else:
+            query_bits = np.packbits(query > 0)
+            for start in range(0, self.size, self.block_size):
+                distances = _POPCOUNT[np.bitwise_xor(codes[start:start + self.block_size], query_bits)].sum(axis=1, dtype=np.int32)
+                # Fewer differing bits means more similar
+                scores[start:start + self.block_size] = -distances
+        return scores
+
+    def _two_stage(self, query: np.ndarray, k: int):
+        """
+        Returns (row ids, exact scores) of the top-k rows, best first.
+        """
+        # Stage 1: cheap scan over compressed codes
+        coarse = self._coarse_scores(query)
+        shortlist_size = min(self.size, k * self.rescore_factor)
+        if shortlist_size < self.size:
+            shortlist = np.argpartition(-coarse, shortlist_size - 1)[:shortlist_size]
+        else:
+            shortlist = np.arange(self.size)
+
+        # Stage 2: exact cosine on the shortlist only (sorted ids keep mmap reads sequential)
+        shortlist.sort()
+        exact = np.asarray(self.full_precision.matrix[shortlist]) @ query
+        if k < len(shortlist):
+            top = np.argpartition(-exact, k - 1)[:k]
+        else:
+            top = np.arange(len(shortlist))
+        top = top[np.argsort(-exact[top], kind="stable")]
+        return shortlist[top], exact[top]
+
+    def search(self, query_vector: List[float], k: int) -> List[dict]:
+        return self.search_batch([query_vector], k)[0]
+
+    def search_batch(self, query_vectors: List[List[float]], k: int) -> List[List[dict]]:
+        if not query_vectors:
+            return []
+        if self.size == 0 or k <= 0:
+            return [[] for _ in query_vectors]
+
+        queries = InMemoryVectorStore._normalize(np.asarray(query_vectors, dtype=np.float32))
+        k = min(k, self.size)
+
+        results = []
+        for query in queries:
+            rows, scores = self._two_stage(query, k)
+            results.append([
+                {
+                    "score": float(score),
+                    "metadata": self.full_precision._metadata(row)
+                }
+                for row, score in zip(rows, scores)
+            ])
+        return results
+
+    def estimate_recall(self, k: int = 10, sample_size: int = 100, seed: int = 0) -> float:
+        """
+        Measure recall@k of the two-stage search against exact search, using
+        a random sample of stored vectors as queries. The result is kept in stats().
+        """
+        if self.size == 0:
+            return 0.0
+
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(self.size, min(sample_size, self.size), replace=False)
+        k = min(k, self.size)
+        matrix = self.full_precision.matrix[:self.size]
+
+        hits = 0
+        for row in sample:
+            query = np.asarray(matrix[row])
+            exact = matrix @ query
+            if k < self.size:
+                expected = np.argpartition(-exact, k - 1)[:k]
+            else:
+                expected = np.arange(self.size)
+            found, _ = self._two_stage(query, k)
+            hits += len(np.intersect1d(expected, found))
+
+        self.last_recall = hits / (len(sample) * k)
+        return self.last_recall
+
+    def stats(self) -> dict:
+        dim = self.full_precision.dim or 0
+        code_bytes = self.codes.shape[1] if self.codes is not None else 0
+        scale_bytes = 4 if self.quantization == "int8" else 0
+        return {
+            "index_type": self.index_type,
+            "count": self.size,
+            "dim": dim,
+            "bytes_per_vector": code_bytes + scale_bytes,
+            "full_precision_bytes_per_vector": dim * 4,
+            "compression_ratio": (dim * 4) / (code_bytes + scale_bytes) if code_bytes else 0.0,
+            "rescore_factor": self.rescore_factor,
+            "recall": self.last_recall
+        }
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
 
 from brainbox.core.knowledge.documents import Document
@@ -6,6 +6,7 @@ from brainbox.core.knowledge.retrieval_result import RetrievalResult
 from brainbox.core.knowledge.retrievers.base import BaseRetriever
 from brainbox.core.vectorstore.chroma import ChromaVectorStore
 from brainbox.core.knowledge.indexing.inverted_index import InvertedIndex
+from brainbox.core.knowledge.indexing.segmented_index import SegmentedIndex
 from brainbox.core.knowledge.retrievers.inverted_index import InvertedIndexRetriever
 from brainbox.core.security.rbac import RBACManager, User
 from brainbox.core.routing.prefix_router import PrefixRouter
@@ -28,7 +29,7 @@ class SecureEnterpriseRAG:
     """
     def __init__(self, 
                  vector_store: ChromaVectorStore,
-                 inverted_index: InvertedIndex,
+                 inverted_index: Union[InvertedIndex, SegmentedIndex],
                  rbac: RBACManager,
                  router: PrefixRouter,
                  graph: ChunkGraph):
@@ -69,11 +70,19 @@ class SecureEnterpriseRAG:
              return SecurePipelineResult("No accessible documents found.", [], signals)
 
         # 4. Graph Expansion (Context/Chunking)
-        # Expand context for top ranked doc
-        top_doc = allowed_docs[0]
-        context_chunks = self.graph.get_contextlist(top_doc.id, window=1)
+        # Expand context for every allowed doc in one batched graph call
+        expanded = self.graph.expand([d.id for d in allowed_docs], window=1)
+        seen = {d.id for d in allowed_docs}
+        context_chunks = []
+        for neighbours in expanded.values():
+            for chunk in neighbours:
+                if chunk is not None and chunk.id not in seen:
+                    seen.add(chunk.id)
+                    context_chunks.append(chunk)
+        # Neighbouring chunks may carry stricter access rules than the hit itself
+        context_chunks = self.rbac.filter_documents(user, context_chunks)
         # Merge context chunks into source list if not present
-        final_docs = [top_doc] + [c for c in context_chunks if c.id != top_doc.id]
+        final_docs = allowed_docs + context_chunks
         
         signals["context_expanded"] = len(context_chunks)
 
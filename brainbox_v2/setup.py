@@ -7,6 +7,7 @@ setup(
     packages=find_packages(),
     python_requires=">=3.9",
     install_requires=[
+        "numpy",
         # TODO: Add your project dependencies here.
         # Examples:
         # "langchain>=0.1.0",